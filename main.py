@@ -17,22 +17,16 @@ Pank Ins 主程序入口
 import sys
 import os
 import logging
+import threading
 from pathlib import Path
-import time
+from types import SimpleNamespace
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
-from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QTimer, Slot
-import pykka
-
-# 导入项目模块
-from src.ui.modern_login_window import ModernLoginWindow
-from src.actors.ui_actor import UIActor
-from src.actors.ai_actor import AIActor
+# 导入项目模块（Qt、pykka及Actor等重量级模块在使用处延迟导入，加快启动）
 from src.config.settings import Settings
 from src.utils.logger_config import setup_logging
 
@@ -47,12 +41,65 @@ def setup_environment():
     # 启用高DPI支持（必须在创建QApplication之前设置）
     os.environ['QT_ENABLE_HIGHDPI_SCALING'] = '1'
     os.environ['QT_SCALE_FACTOR_ROUNDING_POLICY'] = 'PassThrough'
+    
+    # QML编译缓存放在固定目录，二次启动直接复用已编译的QML（用户已指定时不覆盖）
+    qml_cache_dir = Path.home() / ".pank_ins" / "qmlcache"
+    qml_cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault('QML_DISK_CACHE_PATH', str(qml_cache_dir))
+
+
+def _build_parser():
+    """创建完整的命令行参数解析器（仅在需要时导入argparse）"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Pank Ins - AI 控制示波器系统")
+    parser.add_argument(
+        "--skip-login",
+        action="store_true",
+        help="跳过登录直接启动主窗口"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["login", "main"],
+        default="login",
+        help="启动模式: login(登录窗口) 或 main(主窗口)"
+    )
+    return parser
+
+
+def _parse_args(argv=None):
+    """
+    解析命令行参数
+    
+    常见的 --skip-login / --mode 组合直接手工解析；
+    出现 --help 或其他参数时回退到argparse，由其输出帮助或报错。
+    
+    Args:
+        argv: 参数列表，为None时使用sys.argv[1:]
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    options = {"skip_login": False, "mode": "login"}
+    
+    args_iter = iter(argv)
+    for arg in args_iter:
+        if arg == "--skip-login":
+            options["skip_login"] = True
+        elif arg == "--mode":
+            value = next(args_iter, None)
+            if value not in ("login", "main"):
+                return _build_parser().parse_args(argv)
+            options["mode"] = value
+        else:
+            return _build_parser().parse_args(argv)
+    
+    return SimpleNamespace(**options)
 
 
 class PankInsApplication:
     """Pank Ins 应用程序主类"""
     
-    def __init__(self):
+    def __init__(self, args=None):
+        self.args = args if args is not None else _parse_args([])
         self.app = None
         self.login_window = None
         self.ui_actor_ref = None  # UI Actor引用
@@ -60,6 +107,7 @@ class PankInsApplication:
         self.settings = None
         self.logger = None
         self.actor_system_initialized = False
+        self._shutdown_done = False  # Actor系统是否已停止
         
     def setup_logging(self):
         """第一步：设置日志系统"""
@@ -75,6 +123,8 @@ class PankInsApplication:
         try:
             self.logger.info("🎭 步骤2: 初始化Actor系统...")
             
+            import pykka
+            
             # 检查pykka是否已经初始化
             if not hasattr(pykka, '_actor_system') or pykka._actor_system is None:
                 self.logger.info("初始化pykka Actor系统...")
@@ -87,26 +137,46 @@ class PankInsApplication:
             self.logger.error(f"❌ 步骤2失败: Actor系统初始化失败 - {e}")
             raise
             
+    def _wait_ready(self, actor_ref, timeout: float) -> dict:
+        """
+        等待Actor就绪并返回其状态
+        
+        pykka保证on_start()完成后才处理邮箱中的消息，因此get_status()返回的
+        future本身就是就绪信号：它完成即说明Actor已初始化完毕，无需轮询。
+        
+        Args:
+            actor_ref: Actor引用
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            dict: Actor状态，超时时返回空字典
+        """
+        import pykka
+        
+        try:
+            return actor_ref.proxy().get_status().get(timeout=timeout)
+        except pykka.Timeout:
+            return {}
+            
     def start_ui_actor(self):
         """第三步：启动UI Actor"""
         try:
             self.logger.info("🎨 步骤3: 启动UI Actor...")
             
+            from src.actors.ui_actor import UIActor
+            
             # 启动UI Actor
             self.ui_actor_ref = UIActor.start()
             
-            # 等待UI Actor初始化完成
-            time.sleep(0.5)
-            
-            # 检查UI Actor状态
+            # 等待UI Actor就绪并检查状态
             try:
-                status = self.ui_actor_ref.ask({'action': 'get_status'}, timeout=3.0)
+                status = self._wait_ready(self.ui_actor_ref, timeout=3.0)
                 if status.get('status') == 'running':
                     self.logger.info("✅ 步骤3: UI Actor启动成功")
                 else:
-                    self.logger.warning(f"⚠️ UI Actor状态异常: {status}")
+                    self.logger.warning("⚠️ UI Actor状态异常: %s", status)
             except Exception as e:
-                self.logger.warning(f"⚠️ 无法获取UI Actor状态: {e}")
+                self.logger.warning("⚠️ 无法获取UI Actor状态: %s", e)
                 
         except Exception as e:
             self.logger.error(f"❌ 步骤3失败: UI Actor启动失败 - {e}")
@@ -117,21 +187,20 @@ class PankInsApplication:
         try:
             self.logger.info("🤖 步骤4: 启动AI Actor...")
             
+            from src.actors.ai_actor import AIActor
+            
             # 启动AI Actor
             self.ai_actor_ref = AIActor.start()
             
-            # 等待AI Actor初始化完成
-            time.sleep(2.0)  # AI Actor需要更多初始化时间
-            
-            # 检查AI Actor状态
+            # 等待AI Actor就绪并检查状态（AI Actor需要更多初始化时间）
             try:
-                status = self.ai_actor_ref.ask({'action': 'get_status'}, timeout=5.0)
+                status = self._wait_ready(self.ai_actor_ref, timeout=5.0)
                 if status.get('status') == 'running':
                     self.logger.info("✅ 步骤4: AI Actor启动成功")
                 else:
-                    self.logger.warning(f"⚠️ AI Actor状态异常: {status}")
+                    self.logger.warning("⚠️ AI Actor状态异常: %s", status)
             except Exception as e:
-                self.logger.warning(f"⚠️ 无法获取AI Actor状态: {e}")
+                self.logger.warning("⚠️ 无法获取AI Actor状态: %s", e)
                 
         except Exception as e:
             self.logger.error(f"❌ 步骤4失败: AI Actor启动失败 - {e}")
@@ -144,11 +213,9 @@ class PankInsApplication:
             
             # 向UI Actor注册AI Actor
             if self.ui_actor_ref and self.ai_actor_ref:
-                result = self.ui_actor_ref.ask({
-                    'action': 'register_actor',
-                    'actor_name': 'ai',
-                    'actor_ref': self.ai_actor_ref
-                }, timeout=3.0)
+                result = self.ui_actor_ref.proxy().register_actor(
+                    'ai', self.ai_actor_ref
+                ).get(timeout=3.0)
                 
                 if result.get('status') == 'ok':
                     self.logger.info("✅ AI Actor已注册到UI Actor")
@@ -157,10 +224,9 @@ class PankInsApplication:
             
             # 向AI Actor设置UI Actor引用
             if self.ai_actor_ref and self.ui_actor_ref:
-                result = self.ai_actor_ref.ask({
-                    'action': 'set_ui_actor_ref',
-                    'ui_actor_ref': self.ui_actor_ref
-                }, timeout=3.0)
+                result = self.ai_actor_ref.proxy().set_ui_actor_ref(
+                    self.ui_actor_ref
+                ).get(timeout=3.0)
                 
                 if result.get('status') == 'success':
                     self.logger.info("✅ UI Actor引用已设置到AI Actor")
@@ -175,21 +241,17 @@ class PankInsApplication:
         
     def create_application(self):
         """创建QApplication - 在Actor系统启动后"""
+        from PySide6.QtWidgets import QApplication
+        
         # 🔥 关键：使用与qml_main_window.py相同的创建方式
         self.app = QApplication.instance() or QApplication(sys.argv)
         self.app.setApplicationName("Pank Ins")
         self.app.setApplicationVersion("2.0.0")
         self.app.setOrganizationName("Pank Ins Team")
         
-        # 设置高DPI属性 - 与qml_main_window.py一致的方式
-        try:
-            if hasattr(self.app, 'AA_EnableHighDpiScaling'):
-                self.app.setAttribute(self.app.AA_EnableHighDpiScaling, True)
-            if hasattr(self.app, 'AA_UseHighDpiPixmaps'):
-                self.app.setAttribute(self.app.AA_UseHighDpiPixmaps, True)
-        except Exception as e:
-            self.logger.warning(f"⚠️ 设置高DPI属性时出现警告: {e}")
-            
+        # 高DPI：Qt6默认始终启用，缩放策略已在setup_environment()中通过环境变量设置，
+        # 无需在QApplication创建后再逐项探测设置（此时设置也不再生效）
+        
         self.logger.info("✅ QApplication创建完成")
             
     def load_settings(self):
@@ -200,6 +262,7 @@ class PankInsApplication:
     def create_login_window(self):
         """创建登录窗口"""
         self.logger.info("🔐 创建现代化登录窗口...")
+        from src.ui.modern_login_window import ModernLoginWindow
         self.login_window = ModernLoginWindow()
         
         # 连接登录信号
@@ -215,7 +278,6 @@ class PankInsApplication:
         self.logger.info("🎭 登录窗口已显示")
         self.logger.info("📝 测试账户: admin/admin123, user/user123, test/test123")
         
-    @Slot(str, str)
     def on_login_success(self, username: str, password: str):
         """登录成功处理"""
         self.logger.info(f"🎉 用户 {username} 登录成功")
@@ -223,13 +285,15 @@ class PankInsApplication:
         # 隐藏登录窗口
         self.login_window.hide()
         
+        from PySide6.QtCore import QTimer
+        
         # 延迟启动主界面，给用户一些反馈时间
         QTimer.singleShot(500, lambda: self.start_main_application(username))
         
-    @Slot(str)
     def on_login_failed(self, error_msg: str):
         """登录失败处理"""
         self.logger.warning(f"⚠️ 登录失败: {error_msg}")
+        from PySide6.QtWidgets import QMessageBox
         
         # 显示错误消息框
         msg = QMessageBox()
@@ -239,14 +303,28 @@ class PankInsApplication:
         msg.setIcon(QMessageBox.Warning)
         msg.exec()
         
-    @Slot(str)
     def on_theme_changed(self, theme_name: str):
         """主题切换处理"""
         self.logger.info(f"🎨 主题已切换到: {theme_name}")
         
+    def _start_actors_bg(self):
+        """
+        后台线程：启动AI Actor并建立Actor间连接
+        
+        AI Actor注册到UI Actor后，UI Actor通过排队信号在主线程中把引用交给主窗口，
+        主线程无需等待本线程完成
+        """
+        try:
+            self.start_ai_actor()
+            self.setup_actor_connections()
+            self.logger.info("🎯 所有Actor系统启动完成")
+        except Exception as e:
+            self.logger.error(f"❌ 后台启动Actor系统失败: {e}")
+            
     def start_main_application(self, username: str):
         """启动主应用程序"""
         try:
+            # 不等待后台的AI Actor启动：其引用就绪后由UI Actor交给主窗口
             self.logger.info("="*60)
             self.logger.info(f"🚀 启动主应用程序 - 用户: {username}")
             self.logger.info("="*60)
@@ -267,7 +345,7 @@ class PankInsApplication:
                         self.login_window = None
                         
                     self.logger.info("🎯 主应用程序启动完成")
-                    self.logger.info("💡 所有Actor系统已就绪，可以开始使用")
+                    self.logger.info("💡 主界面已就绪，AI Actor启动完成后即可对话")
                     
                 else:
                     self.logger.error(f"❌ 主窗口启动失败: {result.get('message')}")
@@ -277,13 +355,13 @@ class PankInsApplication:
                 self.show_error_message("系统错误", "UI Actor未初始化")
                 
         except Exception as e:
-            self.logger.error(f"❌ 启动主应用程序失败: {e}")
-            import traceback
-            self.logger.error(f"详细错误信息:\n{traceback.format_exc()}")
+            self.logger.exception("❌ 启动主应用程序失败: %s", e)
             self.show_error_message("启动失败", f"错误信息: {str(e)}")
             
     def show_error_message(self, title: str, message: str):
         """显示错误消息对话框"""
+        from PySide6.QtWidgets import QMessageBox
+        
         msg = QMessageBox()
         msg.setWindowTitle(title)
         msg.setText(message)
@@ -291,60 +369,39 @@ class PankInsApplication:
         msg.exec()
         self.app.quit()
             
-    @Slot()
-    def on_main_window_closed(self):
-        """主窗口关闭处理"""
-        self.logger.info("🔄 正在关闭应用...")
+    def _shutdown_once(self):
+        """
+        停止所有Actor（幂等，重复调用直接返回）
+        
+        ActorRegistry.stop_all()会同时停止UI Actor和AI Actor，无需逐个stop()
+        """
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
+        
         try:
-            # 停止Actor系统
-            if self.ai_actor_ref:
-                self.ai_actor_ref.stop()
-                self.logger.info("✅ AI Actor已停止")
-                
-            if self.ui_actor_ref:
-                self.ui_actor_ref.stop()
-                self.logger.info("✅ UI Actor已停止")
-                
-            # 停止整个Actor系统
-            pykka.ActorRegistry.stop_all()
-            self.logger.info("✅ Actor系统已停止")
+            import pykka
             
+            pykka.ActorRegistry.stop_all(block=True, timeout=2.0)
+            self.logger.info("✅ 所有Actor系统已停止")
         except Exception as e:
             self.logger.error(f"❌ 停止Actor系统时出错: {e}")
+        finally:
+            self.ai_actor_ref = None
+            self.ui_actor_ref = None
+        
+    def on_main_window_closed(self):
+        """主窗口关闭处理"""
+        self.logger.info("🔄 正在关闭应用...")
+        self._shutdown_once()
         
         # 退出应用
         self.app.quit()
         
-    @Slot()
     def cleanup_on_exit(self):
         """应用程序退出时的清理处理"""
         self.logger.info("🧹 应用程序退出时清理资源...")
-        try:
-            # 确保所有Actor都被停止
-            if self.ai_actor_ref:
-                try:
-                    self.ai_actor_ref.stop()
-                    self.logger.info("✅ AI Actor已停止")
-                except Exception as e:
-                    self.logger.error(f"❌ 停止AI Actor失败: {e}")
-                    
-            if self.ui_actor_ref:
-                try:
-                    self.ui_actor_ref.stop()
-                    self.logger.info("✅ UI Actor已停止")
-                except Exception as e:
-                    self.logger.error(f"❌ 停止UI Actor失败: {e}")
-            
-            # 确保整个Actor系统被停止
-            try:
-                pykka.ActorRegistry.stop_all()
-                self.logger.info("✅ 所有Actor系统已清理")
-            except Exception as e:
-                self.logger.error(f"❌ 清理Actor系统失败: {e}")
-                
-        except Exception as e:
-            self.logger.error(f"❌ 清理过程中出现异常: {e}")
-        
+        self._shutdown_once()
         self.logger.info("🏁 应用程序清理完成")
         
     def run(self):
@@ -359,18 +416,7 @@ class PankInsApplication:
             # 第二步：初始化Actor系统
             self.initialize_actor_system()
             
-            # 第三步：启动UI Actor
-            self.start_ui_actor()
-            
-            # 第四步：启动AI Actor
-            self.start_ai_actor()
-            
-            # 第五步：建立Actor间连接
-            self.setup_actor_connections()
-            
-            self.logger.info("🎯 所有Actor系统启动完成，开始创建UI界面...")
-            
-            # 创建应用（Actor系统已启动）
+            # 创建应用（先显示界面，Actor在后台继续启动）
             self.create_application()
             
             # 🔥 重要：连接应用程序退出时的清理信号
@@ -379,9 +425,25 @@ class PankInsApplication:
             # 加载配置
             self.load_settings()
             
-            # 创建并显示登录窗口
-            self.create_login_window()
-            self.show_login_window()
+            # 第三步：启动UI Actor（持有Qt信号对象，必须在主线程创建）
+            self.start_ui_actor()
+            
+            # 第四、五步：在后台线程启动AI Actor并建立连接，与登录窗口显示并行
+            threading.Thread(
+                target=self._start_actors_bg,
+                name="ActorStartup",
+                daemon=True
+            ).start()
+            
+            if self.args.skip_login or self.args.mode == "main":
+                # 跳过登录，事件循环启动后直接进入主界面
+                from PySide6.QtCore import QTimer
+                self.logger.info("⏭️ 跳过登录，直接启动主窗口")
+                QTimer.singleShot(0, lambda: self.start_main_application("admin"))
+            else:
+                # 创建并显示登录窗口
+                self.create_login_window()
+                self.show_login_window()
             
             # 运行应用
             exit_code = self.app.exec()
@@ -390,17 +452,21 @@ class PankInsApplication:
             
         except Exception as e:
             if self.logger:
-                self.logger.error(f"❌ 应用启动失败: {e}")
-                import traceback
-                self.logger.error(f"详细错误信息:\n{traceback.format_exc()}")
+                self.logger.exception("❌ 应用启动失败: %s", e)
             else:
                 print(f"❌ 应用启动失败: {e}")
             return 1
 
 
-def main():
-    """主程序入口"""
-    app = PankInsApplication()
+def main(args=None):
+    """
+    主程序入口
+    
+    Args:
+        args: 已解析的命令行参数，为None时从sys.argv解析
+    """
+    args = args or _parse_args()
+    app = PankInsApplication(args)
     return app.run()
 
 
@@ -13,9 +13,15 @@ AI示波器控制系统启动脚本
 import sys
 import os
 import subprocess
+import importlib.metadata
 import importlib.util
 from pathlib import Path
-import argparse
+from types import SimpleNamespace
+
+
+# 项目根目录（本脚本所在目录），检查与标记文件都以它为基准，与当前工作目录无关
+PROJECT_ROOT = Path(__file__).resolve().parent
+REQUIREMENTS_FILE = PROJECT_ROOT / "requirements.txt"
 
 
 def check_python_version():
@@ -35,7 +41,7 @@ def check_virtual_environment():
     """
     检查虚拟环境
     """
-    venv_path = Path(".venv")
+    venv_path = PROJECT_ROOT / ".venv"
     if not venv_path.exists():
         print("⚠️  警告: 未检测到虚拟环境")
         print("   建议创建虚拟环境: python -m venv .venv")
@@ -51,10 +57,50 @@ def check_virtual_environment():
         return False
 
 
+# 检查通过的标记文件，内容为检查通过时被监视路径的修改时间(纳秒)
+DEPS_SENTINEL = PROJECT_ROOT / ".venv" / ".deps_ok"      # 监视 requirements.txt
+STRUCT_SENTINEL = PROJECT_ROOT / ".venv" / ".struct_ok"  # 监视项目根目录
+
+
+def _sentinel_valid(sentinel, watched):
+    """
+    判断上次的检查结果是否可复用
+    
+    被监视路径在上次检查通过后未被修改时返回True
+    """
+    try:
+        return int(sentinel.read_text()) >= Path(watched).stat().st_mtime_ns
+    except (OSError, ValueError):
+        return False
+
+
+def _write_sentinel(sentinel, watched):
+    """
+    记录检查通过（仅在虚拟环境目录存在时写入）
+    """
+    if not sentinel.parent.is_dir():
+        return
+    try:
+        sentinel.write_text(str(Path(watched).stat().st_mtime_ns))
+    except OSError:
+        pass
+
+
+def _normalize_package_name(name):
+    """
+    标准化包名（忽略大小写，'-'、'.'与'_'视为相同）
+    """
+    return name.lower().replace("-", "_").replace(".", "_")
+
+
 def check_dependencies():
     """
     检查依赖库
     """
+    if _sentinel_valid(DEPS_SENTINEL, REQUIREMENTS_FILE):
+        print("✅ 所有依赖库检查通过 (缓存)")
+        return True
+    
     required_packages = [
         ("PySide6", "PySide6"),
         ("qfluentwidgets", "qfluentwidgets"),
@@ -64,9 +110,19 @@ def check_dependencies():
         ("langchain", "langchain")
     ]
     
+    # 一次扫描site-packages中的所有发行包，代替逐个find_spec
+    installed = {
+        _normalize_package_name(dist.metadata["Name"] or "")
+        for dist in importlib.metadata.distributions()
+    }
+    
     missing_packages = []
     
     for package_name, import_name in required_packages:
+        if _normalize_package_name(package_name) in installed:
+            print(f"✅ {package_name} 已安装")
+            continue
+        # 发行包名与导入名不一致时（如qfluentwidgets）再回退到find_spec
         try:
             spec = importlib.util.find_spec(import_name)
             if spec is None:
@@ -81,6 +137,7 @@ def check_dependencies():
         print("   请运行: pip install -r requirements.txt")
         return False
     
+    _write_sentinel(DEPS_SENTINEL, REQUIREMENTS_FILE)
     print("✅ 所有依赖库检查通过")
     return True
 
@@ -89,6 +146,10 @@ def check_project_structure():
     """
     检查项目结构
     """
+    if _sentinel_valid(STRUCT_SENTINEL, PROJECT_ROOT):
+        print("✅ 项目结构检查通过 (缓存)")
+        return True
+    
     required_dirs = [
         "src",
         "src/actors",
@@ -113,12 +174,12 @@ def check_project_structure():
     
     # 检查目录
     for dir_path in required_dirs:
-        if not Path(dir_path).exists():
+        if not (PROJECT_ROOT / dir_path).exists():
             missing_items.append(f"目录: {dir_path}")
     
     # 检查文件
     for file_path in required_files:
-        if not Path(file_path).exists():
+        if not (PROJECT_ROOT / file_path).exists():
             missing_items.append(f"文件: {file_path}")
     
     if missing_items:
@@ -127,6 +188,7 @@ def check_project_structure():
             print(f"   缺少 {item}")
         return False
     
+    _write_sentinel(STRUCT_SENTINEL, PROJECT_ROOT)
     print("✅ 项目结构检查通过")
     return True
 
@@ -137,7 +199,7 @@ def install_dependencies():
     """
     print("🔄 正在安装依赖库...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)])
         print("✅ 依赖库安装完成")
         return True
     except subprocess.CalledProcessError as e:
@@ -152,7 +214,7 @@ def create_missing_directories():
     dirs_to_create = ["logs", "data", "config", "plugins"]
     
     for dir_name in dirs_to_create:
-        dir_path = Path(dir_name)
+        dir_path = PROJECT_ROOT / dir_name
         if not dir_path.exists():
             dir_path.mkdir(parents=True, exist_ok=True)
             print(f"✅ 创建目录: {dir_name}")
@@ -163,24 +225,15 @@ def run_application(args=None):
     运行应用程序
     
     Args:
-        args (list): 命令行参数列表
+        args: 已解析的命令行参数，直接传递给main.py
     """
     print("\n🚀 启动AI示波器控制系统...")
     print("=" * 50)
     
     try:
-        # 如果有参数，临时修改sys.argv
-        original_argv = sys.argv.copy()
-        if args:
-            sys.argv = [sys.argv[0]] + args
-        
-        try:
-            # 导入并运行主程序
-            from main import main
-            return main()
-        finally:
-            # 恢复原始的sys.argv
-            sys.argv = original_argv
+        # 导入并运行主程序
+        from main import main as _main
+        return _main(args)
             
     except KeyboardInterrupt:
         print("\n⏹️  用户中断程序")
@@ -192,11 +245,12 @@ def run_application(args=None):
         return 1
 
 
-def main():
+def _build_parser():
     """
-    主函数
+    创建完整的命令行参数解析器（仅在需要时导入argparse）
     """
-    # 创建参数解析器
+    import argparse
+    
     parser = argparse.ArgumentParser(description="AI示波器控制系统启动脚本")
     parser.add_argument(
         "--skip-login", 
@@ -214,8 +268,43 @@ def main():
         action="store_true",
         help="跳过环境检查直接启动"
     )
+    return parser
+
+
+def _parse_args(argv=None):
+    """
+    解析命令行参数
     
-    args = parser.parse_args()
+    常见参数组合直接手工解析，出现 --help 或其他参数时回退到argparse
+    
+    Args:
+        argv (list): 参数列表，为None时使用sys.argv[1:]
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    options = {"skip_login": False, "mode": "login", "skip_checks": False}
+    
+    args_iter = iter(argv)
+    for arg in args_iter:
+        if arg == "--skip-login":
+            options["skip_login"] = True
+        elif arg == "--skip-checks":
+            options["skip_checks"] = True
+        elif arg == "--mode":
+            value = next(args_iter, None)
+            if value not in ("login", "main"):
+                return _build_parser().parse_args(argv)
+            options["mode"] = value
+        else:
+            return _build_parser().parse_args(argv)
+    
+    return SimpleNamespace(**options)
+
+
+def main():
+    """
+    主函数
+    """
+    args = _parse_args()
     
     print("AI示波器控制系统 - 启动检查")
     print("=" * 40)
@@ -225,14 +314,7 @@ def main():
         print("⚠️  跳过环境检查，直接启动应用程序")
         print("=" * 40)
         
-        # 准备传递给main.py的参数
-        main_args = []
-        if args.skip_login:
-            main_args.append("--skip-login")
-        if args.mode:
-            main_args.extend(["--mode", args.mode])
-            
-        return run_application(main_args)
+        return run_application(args)
     
     # 环境检查
     checks_passed = True
@@ -267,15 +349,8 @@ def main():
     print("\n✅ 所有检查通过，准备启动应用程序")
     print("=" * 40)
     
-    # 准备传递给main.py的参数
-    main_args = []
-    if args.skip_login:
-        main_args.append("--skip-login")
-    if args.mode:
-        main_args.extend(["--mode", args.mode])
-    
     # 运行应用程序
-    exit_code = run_application(main_args)
+    exit_code = run_application(args)
     
     if exit_code != 0:
         print("\n程序异常退出")
@@ -6,14 +6,42 @@ Actor模块
 
 包含所有系统Actor的实现。
 
+各Actor依赖较重（Qt、langchain、numpy等），因此采用PEP 562的模块级
+``__getattr__`` 按需导入，仅在首次访问时加载对应子模块。
+
 @author: PankIns Team
 @version: 1.0.0
 """
 
-from .base_actor import BaseActor
-from .ui_actor import UIActor
+import importlib
 
 __all__ = [
     'BaseActor',
-    'UIActor', 
-] 
\ No newline at end of file
+    'UIActor',
+    'AIActor',
+    'OscilloscopeActor',
+    'DataProcessorActor',
+]
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    'BaseActor': '.base_actor',
+    'UIActor': '.ui_actor',
+    'AIActor': '.ai_actor',
+    'OscilloscopeActor': '.oscilloscope_actor',
+    'DataProcessorActor': '.data_processor_actor',
+}
+
+
+def __getattr__(name):
+    """首次访问时导入对应子模块并缓存到模块命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -14,7 +14,8 @@ AI Actor模块
 import os
 import sys
 import pykka
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
 
 # 添加项目根目录到Python路径
 current_dir = os.path.dirname(__file__)
@@ -22,11 +23,21 @@ project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
 sys.path.insert(0, project_root)
 
 from src.utils.logger_config import get_logger
-# 🔥 修改：使用真正的chain而不是测试版本
-from src.ai_chat.chain.level_base_chain import LevelBaseChain
+from src.utils import json_utils
 
 logger = get_logger(__name__)
 
+# 活跃容器记录的最大数量，超出时只移除最久未使用的记录，对话历史保留
+MAX_ACTIVE_CONTAINERS = 256
+
+# 处理前需要确保chain已初始化的消息类型
+_CHAIN_ACTIONS = frozenset({
+    'process_message',
+    'process_message_stream',
+    'get_history',
+    'clear_history',
+})
+
 
 class AIActor(pykka.ThreadingActor):
     """
@@ -43,11 +54,23 @@ class AIActor(pykka.ThreadingActor):
     def __init__(self):
         super().__init__()
         self.chain = None
-        self.active_containers = set()
+        self.active_containers = OrderedDict()  # 按最近使用排序的容器ID
         self._chain_initialized = False
         self.ui_actor_ref = None  # UI Actor引用
         self.main_window_ref = None  # 主窗口引用（用于直接调用）
         
+        # 消息处理器映射
+        self._action_handlers: Dict[str, Callable[[dict], Dict[str, Any]]] = {
+            'get_status': self._handle_get_status,
+            'set_ui_actor_ref': self._handle_set_ui_actor_ref,
+            'set_main_window_ref': self._handle_set_main_window_ref,
+            'process_message': self._handle_process_message,
+            'process_message_stream': self._handle_process_message_stream,
+            'get_history': self._handle_get_history,
+            'clear_history': self._handle_clear_history,
+            'batch': self._handle_batch,
+        }
+        
     def on_start(self):
         """Actor启动时初始化"""
         try:
@@ -61,23 +84,19 @@ class AIActor(pykka.ThreadingActor):
         """确保 chain 已初始化"""
         if not self._chain_initialized:
             try:
-                # 🔥 修改：使用真正的LevelBaseChain
+                # 🔥 修改：使用真正的chain而不是测试版本
+                # 在首次使用时才导入，避免导入本模块时加载整个LLM依赖链
+                from src.ai_chat.chain.level_base_chain import LevelBaseChain
                 
                 def stream_callback(event_type, data):
                     """流式回调函数"""
-                    logger.debug(f"流式回调: {event_type} - {data}")
+                    logger.debug("流式回调: %s - %s", event_type, data)
                     try:
                         # 🔧 修复：解析AI响应中的JSON格式
                         processed_data = self._process_stream_data(event_type, data)
                         
-                        # 发送流式更新给UI Actor
-                        if self.ui_actor_ref:
-                            self.ui_actor_ref.tell({
-                                'action': 'ai_chat_update_stream',
-                                'event_type': event_type,
-                                'data': processed_data
-                            })
-                            logger.debug(f"已发送流式更新: {event_type}")
+                        # 发送流式更新给UI Actor（片段由UI Actor按帧合并刷新）
+                        self._send_stream_update(event_type, processed_data)
                     except Exception as e:
                         logger.error(f"流式回调处理错误: {e}")
                 
@@ -91,24 +110,39 @@ class AIActor(pykka.ThreadingActor):
                 logger.info("🚀 真正的LevelBaseChain 初始化完成")
                 
             except Exception as e:
-                logger.error(f"LevelBaseChain 初始化失败: {e}")
-                logger.error(f"错误详情: {type(e).__name__}: {str(e)}")
-                import traceback
-                logger.error(f"错误堆栈:\n{traceback.format_exc()}")
+                logger.exception("LevelBaseChain 初始化失败: %s: %s", type(e).__name__, e)
                 
+    def _send_stream_update(self, event_type, data):
+        """发送流式更新给UI Actor"""
+        if self.ui_actor_ref:
+            self.ui_actor_ref.tell({
+                'action': 'ai_chat_update_stream',
+                'event_type': event_type,
+                'data': data
+            })
+            logger.debug("已发送流式更新: %s", event_type)
+    
     def _process_stream_data(self, event_type, data):
         """处理流式数据，解析JSON格式的AI响应"""
         try:
-            if event_type == "STREAM_CHUNK" and data:
-                # 尝试解析JSON格式的响应
-                import json
-                try:
-                    json_data = json.loads(data)
-                    if isinstance(json_data, dict) and 'content' in json_data:
-                        return json_data['content']
-                except json.JSONDecodeError:
-                    # 如果不是JSON，直接返回原始数据
-                    pass
+            if event_type != "STREAM_CHUNK":
+                return data
+            
+            if isinstance(data, dict):
+                # 已是结构化数据时直接取内容，无需再经过JSON
+                return data.get('content', data)
+            
+            if isinstance(data, str):
+                # 绝大多数片段是普通文本，只有以'{'开头时才尝试解析JSON
+                text = data.lstrip()
+                if text.startswith('{'):
+                    try:
+                        json_data = json_utils.loads(text)
+                        if isinstance(json_data, dict) and 'content' in json_data:
+                            return json_data['content']
+                    except json_utils.JSONDecodeError:
+                        # 如果不是JSON，直接返回原始数据
+                        pass
             return data
         except Exception as e:
             logger.error(f"处理流式数据时出错: {e}")
@@ -128,68 +162,96 @@ class AIActor(pykka.ThreadingActor):
                 return {"status": "error", "message": "消息格式错误"}
             
             action = message.get('action')
+            handler = self._action_handlers.get(action)
             
-            if action == 'get_status':
-                return {
-                    "status": "running", 
-                    "actor_type": "AIActor",
-                    "chain_initialized": self._chain_initialized,
-                    "chain_type": "真正的LevelBaseChain"  # 添加chain类型标识
-                }
-            
-            elif action == 'set_ui_actor_ref':
-                self.ui_actor_ref = message.get('ui_actor_ref')
-                logger.info("AI Actor已设置UI Actor引用")
-                return {"status": "success", "message": "UI Actor引用已设置"}
-            
-            elif action == 'set_main_window_ref':
-                self.main_window_ref = message.get('main_window_ref')
-                logger.info("AI Actor已设置主窗口引用")
-                # 重新初始化chain以使用新的回调
-                self._chain_initialized = False
-                self._ensure_chain_initialized()
-                return {"status": "success", "message": "主窗口引用已设置"}
-            
-            elif action == 'process_message':
-                self._ensure_chain_initialized()
-                return self._handle_process_message(message)
-                
-            elif action == 'process_message_stream':
-                self._ensure_chain_initialized()
-                return self._handle_process_message_stream(message)
-            
-            elif action == 'get_history':
-                self._ensure_chain_initialized()
-                return self._handle_get_history(message)
-            
-            elif action == 'clear_history':
-                self._ensure_chain_initialized()
-                return self._handle_clear_history(message)
-            
-            else:
+            if handler is None:
                 logger.warning(f"收到未知消息类型: {action}")
                 return {"status": "error", "message": f"未知消息类型: {action}"}
+            
+            if action in _CHAIN_ACTIONS:
+                self._ensure_chain_initialized()
+            return handler(message)
                 
         except Exception as e:
             logger.error(f"处理消息时发生错误: {e}")
             return {"status": "error", "message": str(e)}
     
+    def _handle_batch(self, message: dict) -> list:
+        """
+        处理批量消息：在Actor线程内依次处理，一次返回全部结果
+        
+        结果与items一一对应，单条消息出错只影响它自己的结果
+        """
+        return [self._handle_batch_item(item) for item in message.get('items', [])]
+    
+    def _handle_batch_item(self, item) -> Dict[str, Any]:
+        """处理批量消息中的一条，拒绝嵌套的批量消息（避免无限递归）"""
+        if isinstance(item, dict) and item.get('action') == 'batch':
+            logger.warning("批量消息中包含嵌套的批量消息，已拒绝")
+            return {"status": "error", "message": "批量消息不能嵌套"}
+        return self.on_receive(item)
+    
+    def _handle_get_status(self, message: dict) -> Dict[str, Any]:
+        """处理获取状态的消息"""
+        return self.get_status()
+    
+    def _handle_set_ui_actor_ref(self, message: dict) -> Dict[str, Any]:
+        """处理设置UI Actor引用的消息"""
+        return self.set_ui_actor_ref(message.get('ui_actor_ref'))
+    
+    def _handle_set_main_window_ref(self, message: dict) -> Dict[str, Any]:
+        """处理设置主窗口引用的消息"""
+        self.main_window_ref = message.get('main_window_ref')
+        logger.info("AI Actor已设置主窗口引用")
+        # 流式回调在调用时才读取self上的引用，无需重建chain
+        return {"status": "success", "message": "主窗口引用已设置"}
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取AI Actor状态（可通过proxy直接调用）"""
+        return {
+            "status": "running", 
+            "actor_type": "AIActor",
+            "chain_initialized": self._chain_initialized,
+            "chain_type": "真正的LevelBaseChain"  # 添加chain类型标识
+        }
+    
+    def set_ui_actor_ref(self, ui_actor_ref) -> Dict[str, Any]:
+        """设置UI Actor引用（可通过proxy直接调用）"""
+        self.ui_actor_ref = ui_actor_ref
+        logger.info("AI Actor已设置UI Actor引用")
+        return {"status": "success", "message": "UI Actor引用已设置"}
+    
+    def _touch_container(self, container_id: str):
+        """
+        将容器标记为最近使用，超出上限时移除最久未使用的容器记录
+        
+        只限制活跃容器记录的数量，不删除history_manager中的对话历史
+        
+        Args:
+            container_id: 对话容器ID
+        """
+        self.active_containers[container_id] = None
+        self.active_containers.move_to_end(container_id)
+        
+        while len(self.active_containers) > MAX_ACTIVE_CONTAINERS:
+            self.active_containers.popitem(last=False)
+    
     def _handle_process_message(self, message: dict) -> Dict[str, Any]:
         """处理用户消息"""
         try:
             container_id = message.get('container_id', 'default')
             content = message.get('content', '')
             
-            logger.info(f"🤖 处理用户消息 - 容器ID: {container_id}, 内容: {content[:50]}...")
+            logger.info("🤖 处理用户消息 - 容器ID: %s, 内容: %.50s...", container_id, content)
             
             # 添加到活跃容器列表
-            self.active_containers.add(container_id)
+            self._touch_container(container_id)
             
             # 使用真正的LevelBaseChain处理消息
             response = self.chain.process_message(container_id, content)
             
             logger.info(f"✅ 消息处理完成 - 容器ID: {container_id}")
-            logger.debug(f"AI响应: {response[:100]}...")
+            logger.debug("AI响应: %.100s...", response)
             
             return {
                 "status": "success",
@@ -198,9 +260,7 @@ class AIActor(pykka.ThreadingActor):
             }
             
         except Exception as e:
-            logger.error(f"处理用户消息失败: {e}")
-            import traceback
-            logger.error(f"错误详情:\n{traceback.format_exc()}")
+            logger.exception("处理用户消息失败: %s", e)
             return {
                 "status": "error",
                 "container_id": message.get('container_id', 'default'),
@@ -213,10 +273,10 @@ class AIActor(pykka.ThreadingActor):
             container_id = message.get('container_id', 'default')
             content = message.get('content', '')
             
-            logger.info(f"处理流式响应消息 - 容器ID: {container_id}, 内容: {content[:50]}...")
+            logger.info("处理流式响应消息 - 容器ID: %s, 内容: %.50s...", container_id, content)
             
             # 添加到活跃容器列表
-            self.active_containers.add(container_id)
+            self._touch_container(container_id)
             
             # 使用LevelBaseChain处理消息（流式回调会自动调用）
             response = self.chain.process_message(container_id, content)
@@ -312,6 +372,22 @@ class AIActorManager:
         
         return self.actor_ref.ask(message)
     
+    def send_message_batch(self, messages: list) -> list:
+        """
+        批量发送消息到Actor
+        
+        多条消息合并为一条邮箱消息，只需一次往返即可得到全部结果
+        
+        Args:
+            messages: 消息列表（不能包含批量消息，嵌套的批量消息得到错误结果）
+            
+        Returns:
+            list: 与messages一一对应的处理结果
+        """
+        if not messages:
+            return []
+        return self.send_message({"action": "batch", "items": list(messages)})
+    
     def process_user_message(self, container_id: str, content: str) -> Dict[str, Any]:
         """处理用户消息的便捷方法"""
         message = {
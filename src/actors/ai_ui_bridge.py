@@ -15,12 +15,16 @@ import logging
 import pykka
 from typing import Dict, Any, List, Optional, Callable
 from enum import Enum
+import itertools
+import threading
 import time
-import uuid
+from collections import deque
 
+from src.utils import json_utils
 
-class MessageType(Enum):
-    """消息类型枚举"""
+
+class MessageType(str, Enum):
+    """消息类型枚举（继承str，作为处理器映射的键时使用str的哈希与比较）"""
     # AI查询相关
     AI_CHAT_QUERY = "ai_chat_query"           # 用户聊天查询
     AI_CHAT_RESPONSE = "ai_chat_response"     # AI聊天响应
@@ -42,11 +46,20 @@ class MessageType(Enum):
     DATA_ACQUISITION = "data_acquisition"     # 数据采集
 
 
+# 消息类型值 -> 枚举成员，反序列化时直接查表，避免MessageType(value)的调用开销
+_TYPE_BY_VALUE: Dict[str, MessageType] = {member.value: member for member in MessageType}
+
+# 进程内消息ID生成器（单调递增整数，比uuid4开销小得多）
+_message_ids = itertools.count(1)
+
+
 class AIMessage:
     """AI消息类"""
     
+    __slots__ = ('id', 'type', 'data', 'sender', 'correlation_id', 'timestamp')
+    
     def __init__(self, msg_type: MessageType, data: Dict[str, Any], 
-                 sender: str = None, correlation_id: str = None):
+                 sender: str = None, correlation_id: int = None, timestamp: float = None):
         """
         初始化AI消息
         
@@ -54,14 +67,15 @@ class AIMessage:
             msg_type (MessageType): 消息类型
             data (Dict[str, Any]): 消息数据
             sender (str): 发送者标识
-            correlation_id (str): 关联ID，用于请求-响应配对
+            correlation_id (int): 关联ID，用于请求-响应配对
+            timestamp (float): 创建时间，为None时读取当前时间
         """
-        self.id = str(uuid.uuid4())
+        self.id = next(_message_ids)
         self.type = msg_type
         self.data = data
         self.sender = sender or "unknown"
         self.correlation_id = correlation_id or self.id
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else timestamp
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -78,14 +92,23 @@ class AIMessage:
     def from_dict(cls, data: Dict[str, Any]) -> 'AIMessage':
         """从字典创建消息"""
         msg = cls(
-            msg_type=MessageType(data["type"]),
+            msg_type=_TYPE_BY_VALUE[data["type"]],
             data=data["data"],
             sender=data.get("sender"),
-            correlation_id=data.get("correlation_id")
+            correlation_id=data.get("correlation_id"),
+            timestamp=data["timestamp"]
         )
         msg.id = data["id"]
-        msg.timestamp = data["timestamp"]
         return msg
+    
+    def to_bytes(self) -> bytes:
+        """序列化为JSON字节串（用于跨进程/网络/持久化等序列化边界）"""
+        return json_utils.dumps(self.to_dict())
+    
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> 'AIMessage':
+        """从JSON字节串创建消息"""
+        return cls.from_dict(json_utils.loads(buf))
 
 
 class AIUIBridge:
@@ -100,7 +123,9 @@ class AIUIBridge:
         self.logger = logging.getLogger(__name__)
         self._ai_actor_ref: Optional[pykka.ActorRef] = None
         self._ui_actor_ref: Optional[pykka.ActorRef] = None
-        self._pending_requests: Dict[str, Dict[str, Any]] = {}
+        self._pending_requests: Dict[int, Dict[str, Any]] = {}
+        # 按登记时间排序的(登记时间, 请求ID)，用于快速找出过期请求
+        self._request_order: deque = deque()
         
         # 消息处理器映射
         self._message_handlers: Dict[MessageType, Callable] = {
@@ -134,7 +159,7 @@ class AIUIBridge:
         self.logger.info("UI Actor已注册到桥接器")
     
     def send_ai_query(self, query: str, context: Dict[str, Any] = None, 
-                     callback: Callable = None) -> str:
+                     callback: Callable = None) -> int:
         """
         发送AI查询
         
@@ -144,39 +169,16 @@ class AIUIBridge:
             callback (Callable): 响应回调函数
             
         Returns:
-            str: 请求ID
+            int: 请求ID
         """
-        if not self._ai_actor_ref:
-            self.logger.error("AI Actor未注册")
-            return None
-        
-        message = AIMessage(
-            msg_type=MessageType.AI_CHAT_QUERY,
-            data={
-                "query": query,
-                "context": context or {},
-                "timestamp": time.time()
-            },
-            sender="ui"
+        return self._send_ai_request(
+            MessageType.AI_CHAT_QUERY,
+            {"query": query, "context": context or {}},
+            callback, "AI查询", query
         )
-        
-        # 记录待处理请求
-        if callback:
-            self._pending_requests[message.correlation_id] = {
-                "callback": callback,
-                "timestamp": time.time()
-            }
-        
-        try:
-            self._ai_actor_ref.tell(message.to_dict())
-            self.logger.info(f"发送AI查询: {query[:50]}...")
-            return message.correlation_id
-        except Exception as e:
-            self.logger.error(f"发送AI查询失败: {e}")
-            return None
     
     def send_analysis_request(self, data: Dict[str, Any], analysis_type: str = "signal",
-                            callback: Callable = None) -> str:
+                            callback: Callable = None) -> int:
         """
         发送数据分析请求
         
@@ -186,39 +188,16 @@ class AIUIBridge:
             callback (Callable): 响应回调函数
             
         Returns:
-            str: 请求ID
+            int: 请求ID
         """
-        if not self._ai_actor_ref:
-            self.logger.error("AI Actor未注册")
-            return None
-        
-        message = AIMessage(
-            msg_type=MessageType.AI_ANALYSIS_REQUEST,
-            data={
-                "analysis_data": data,
-                "analysis_type": analysis_type,
-                "timestamp": time.time()
-            },
-            sender="ui"
+        return self._send_ai_request(
+            MessageType.AI_ANALYSIS_REQUEST,
+            {"analysis_data": data, "analysis_type": analysis_type},
+            callback, "分析请求", analysis_type
         )
-        
-        # 记录待处理请求
-        if callback:
-            self._pending_requests[message.correlation_id] = {
-                "callback": callback,
-                "timestamp": time.time()
-            }
-        
-        try:
-            self._ai_actor_ref.tell(message.to_dict())
-            self.logger.info(f"发送分析请求: {analysis_type}")
-            return message.correlation_id
-        except Exception as e:
-            self.logger.error(f"发送分析请求失败: {e}")
-            return None
     
     def send_workflow_request(self, objective: str, parameters: Dict[str, Any] = None,
-                            callback: Callable = None) -> str:
+                            callback: Callable = None) -> int:
         """
         发送工作流程生成请求
         
@@ -228,37 +207,67 @@ class AIUIBridge:
             callback (Callable): 响应回调函数
             
         Returns:
-            str: 请求ID
+            int: 请求ID
+        """
+        return self._send_ai_request(
+            MessageType.AI_WORKFLOW_REQUEST,
+            {"objective": objective, "parameters": parameters or {}},
+            callback, "工作流程请求", objective
+        )
+    
+    def _send_ai_request(self, msg_type: MessageType, data: Dict[str, Any],
+                         callback: Optional[Callable], description: str, summary: Any) -> Optional[int]:
+        """
+        发送请求给AI Actor（各send_*请求方法的公共实现）
+        
+        Args:
+            msg_type (MessageType): 消息类型
+            data (Dict[str, Any]): 消息数据，会补充timestamp字段
+            callback (Callable): 响应回调函数
+            description (str): 请求描述，用于日志
+            summary (Any): 请求摘要，用于日志
+            
+        Returns:
+            int: 请求ID，发送失败时为None
         """
         if not self._ai_actor_ref:
             self.logger.error("AI Actor未注册")
             return None
         
-        message = AIMessage(
-            msg_type=MessageType.AI_WORKFLOW_REQUEST,
-            data={
-                "objective": objective,
-                "parameters": parameters or {},
-                "timestamp": time.time()
-            },
-            sender="ui"
-        )
+        now = time.time()
+        data["timestamp"] = now
+        message = AIMessage(msg_type=msg_type, data=data, sender="ui", timestamp=now)
         
         # 记录待处理请求
         if callback:
-            self._pending_requests[message.correlation_id] = {
-                "callback": callback,
-                "timestamp": time.time()
-            }
+            self._add_pending_request(message.correlation_id, callback)
         
         try:
             self._ai_actor_ref.tell(message.to_dict())
-            self.logger.info(f"发送工作流程请求: {objective}")
+            self.logger.info("发送%s: %.50s", description, summary)
             return message.correlation_id
         except Exception as e:
-            self.logger.error(f"发送工作流程请求失败: {e}")
+            self.logger.error("发送%s失败: %s", description, e)
             return None
     
+    def _add_pending_request(self, correlation_id: int, callback: Callable):
+        """
+        登记待处理请求
+        
+        Args:
+            correlation_id (int): 请求ID
+            callback (Callable): 响应回调函数
+        """
+        # 登记新请求前先清理队首已过期或已响应的请求，保证队列不会无限增长
+        self.cleanup_expired_requests()
+        
+        timestamp = time.monotonic()
+        self._pending_requests[correlation_id] = {
+            "callback": callback,
+            "timestamp": timestamp
+        }
+        self._request_order.append((timestamp, correlation_id))
+    
     def update_ui_status(self, status_type: str, value: Any):
         """
         更新UI状态
@@ -267,25 +276,12 @@ class AIUIBridge:
             status_type (str): 状态类型
             value (Any): 状态值
         """
-        if not self._ui_actor_ref:
-            self.logger.error("UI Actor未注册")
-            return
-        
-        message = AIMessage(
-            msg_type=MessageType.UI_STATUS_UPDATE,
-            data={
-                "status_type": status_type,
-                "value": value,
-                "timestamp": time.time()
-            },
-            sender="ai"
-        )
-        
-        try:
-            self._ui_actor_ref.tell(message.to_dict())
-            self.logger.debug(f"更新UI状态: {status_type} = {value}")
-        except Exception as e:
-            self.logger.error(f"更新UI状态失败: {e}")
+        if self._send_ui_message(
+            MessageType.UI_STATUS_UPDATE,
+            {"status_type": status_type, "value": value},
+            "更新UI状态"
+        ):
+            self.logger.debug("更新UI状态: %s = %s", status_type, value)
     
     def send_ui_notification(self, title: str, message: str, level: str = "info"):
         """
@@ -296,26 +292,39 @@ class AIUIBridge:
             message (str): 通知内容
             level (str): 通知级别 (info, warning, error)
         """
+        if self._send_ui_message(
+            MessageType.UI_NOTIFICATION,
+            {"title": title, "message": message, "level": level},
+            "发送UI通知"
+        ):
+            self.logger.info("发送UI通知: [%s] %s", level, title)
+    
+    def _send_ui_message(self, msg_type: MessageType, data: Dict[str, Any], description: str) -> bool:
+        """
+        发送消息给UI Actor（UI更新方法的公共实现）
+        
+        Args:
+            msg_type (MessageType): 消息类型
+            data (Dict[str, Any]): 消息数据，会补充timestamp字段
+            description (str): 操作描述，用于日志
+            
+        Returns:
+            bool: 是否发送成功
+        """
         if not self._ui_actor_ref:
             self.logger.error("UI Actor未注册")
-            return
+            return False
         
-        notification = AIMessage(
-            msg_type=MessageType.UI_NOTIFICATION,
-            data={
-                "title": title,
-                "message": message,
-                "level": level,
-                "timestamp": time.time()
-            },
-            sender="ai"
-        )
+        now = time.time()
+        data["timestamp"] = now
+        message = AIMessage(msg_type=msg_type, data=data, sender="ai", timestamp=now)
         
         try:
-            self._ui_actor_ref.tell(notification.to_dict())
-            self.logger.info(f"发送UI通知: [{level}] {title}")
+            self._ui_actor_ref.tell(message.to_dict())
+            return True
         except Exception as e:
-            self.logger.error(f"发送UI通知失败: {e}")
+            self.logger.error("%s失败: %s", description, e)
+            return False
     
     def handle_message(self, message_dict: Dict[str, Any]):
         """
@@ -331,35 +340,35 @@ class AIUIBridge:
             if handler:
                 handler(message)
             else:
-                self.logger.warning(f"未知消息类型: {message.type.value}")
+                self.logger.warning("未知消息类型: %s", message.type.value)
                 
         except Exception as e:
-            self.logger.error(f"处理消息失败: {e}")
+            self.logger.error("处理消息失败: %s", e)
     
     def _handle_ai_chat_query(self, message: AIMessage):
         """处理AI聊天查询"""
         # 这里可以添加查询预处理逻辑
-        self.logger.debug(f"处理AI聊天查询: {message.data.get('query', '')[:50]}...")
+        self.logger.debug("处理AI聊天查询: %.50s...", message.data.get('query', ''))
     
     def _handle_ai_analysis_request(self, message: AIMessage):
         """处理AI分析请求"""
-        self.logger.debug(f"处理AI分析请求: {message.data.get('analysis_type', 'unknown')}")
+        self.logger.debug("处理AI分析请求: %s", message.data.get('analysis_type', 'unknown'))
     
     def _handle_ai_workflow_request(self, message: AIMessage):
         """处理AI工作流程请求"""
-        self.logger.debug(f"处理AI工作流程请求: {message.data.get('objective', 'unknown')}")
+        self.logger.debug("处理AI工作流程请求: %s", message.data.get('objective', 'unknown'))
     
     def _handle_ui_status_update(self, message: AIMessage):
         """处理UI状态更新"""
         status_type = message.data.get('status_type')
         value = message.data.get('value')
-        self.logger.debug(f"处理UI状态更新: {status_type} = {value}")
+        self.logger.debug("处理UI状态更新: %s = %s", status_type, value)
     
     def _handle_ui_notification(self, message: AIMessage):
         """处理UI通知"""
         title = message.data.get('title')
         level = message.data.get('level', 'info')
-        self.logger.debug(f"处理UI通知: [{level}] {title}")
+        self.logger.debug("处理UI通知: [%s] %s", level, title)
     
     def handle_response(self, response_dict: Dict[str, Any]):
         """
@@ -370,24 +379,28 @@ class AIUIBridge:
         """
         try:
             correlation_id = response_dict.get("correlation_id")
+            # 经过JSON/QML等边界回传的ID可能变成字符串，统一转换为int键
+            if isinstance(correlation_id, str) and correlation_id.isdigit():
+                correlation_id = int(correlation_id)
             if not correlation_id:
                 return
             
-            # 查找待处理请求
-            pending_request = self._pending_requests.get(correlation_id)
+            # 取出并清理待处理请求（回调出错时也不会残留）
+            pending_request = self._pending_requests.pop(correlation_id, None)
             if not pending_request:
                 return
+            self.cleanup_expired_requests()
             
             # 调用回调函数
             callback = pending_request.get("callback")
             if callback:
-                callback(response_dict)
-            
-            # 清理待处理请求
-            del self._pending_requests[correlation_id]
+                try:
+                    callback(response_dict)
+                except Exception:
+                    self.logger.exception("响应回调执行失败: %s", correlation_id)
             
         except Exception as e:
-            self.logger.error(f"处理响应失败: {e}")
+            self.logger.error("处理响应失败: %s", e)
     
     def cleanup_expired_requests(self, timeout: float = 300.0):
         """
@@ -396,16 +409,18 @@ class AIUIBridge:
         Args:
             timeout (float): 超时时间（秒）
         """
-        current_time = time.time()
-        expired_ids = []
-        
-        for request_id, request_info in self._pending_requests.items():
-            if current_time - request_info["timestamp"] > timeout:
-                expired_ids.append(request_id)
+        # 请求按登记时间顺序入队，只需从队首弹出过期项，无需遍历全部请求
+        deadline = time.monotonic() - timeout
         
-        for request_id in expired_ids:
-            del self._pending_requests[request_id]
-            self.logger.warning(f"清理过期请求: {request_id}")
+        while self._request_order:
+            timestamp, request_id = self._request_order[0]
+            # 已收到响应的请求不在_pending_requests中，直接出队
+            if request_id in self._pending_requests:
+                if timestamp >= deadline:
+                    break
+                del self._pending_requests[request_id]
+                self.logger.warning("清理过期请求: %s", request_id)
+            self._request_order.popleft()
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -424,11 +439,14 @@ class AIUIBridge:
 
 # 全局桥接器实例
 _ai_ui_bridge = None
+_ai_ui_bridge_lock = threading.Lock()
 
 
 def get_ai_ui_bridge() -> AIUIBridge:
-    """获取全局AI-UI桥接器实例"""
+    """获取全局AI-UI桥接器实例（线程安全，只会创建一个实例）"""
     global _ai_ui_bridge
     if _ai_ui_bridge is None:
-        _ai_ui_bridge = AIUIBridge()
+        with _ai_ui_bridge_lock:
+            if _ai_ui_bridge is None:
+                _ai_ui_bridge = AIUIBridge()
     return _ai_ui_bridge 
\ No newline at end of file
@@ -12,7 +12,7 @@
 
 import logging
 import pykka
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from abc import ABC, abstractmethod
 
 
@@ -28,18 +28,26 @@ class BaseActor(pykka.ThreadingActor, ABC):
         初始化基础Actor
         """
         super().__init__()
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        self._class_name = type(self).__name__  # Actor的类型在其生命周期内不变
+        self.logger = logging.getLogger(self._class_name)
         self._is_initialized = False
         self._status = "stopped"
         
-        self.logger.info(f"{self.__class__.__name__} Actor创建")
+        # 通用消息处理器映射，未命中的消息委托给子类的handle_message
+        self._base_handlers: Dict[str, Callable[[dict], Any]] = {
+            'get_status': self._handle_get_status,
+            'ping': self._handle_ping,
+            'stop': self._handle_stop,
+        }
+        
+        self.logger.info("%s Actor创建", self._class_name)
     
     def on_start(self):
         """
         Actor启动时调用
         """
         try:
-            self.logger.info(f"{self.__class__.__name__} Actor启动中...")
+            self.logger.info("%s Actor启动中...", self._class_name)
             self._status = "starting"
             
             # 调用子类的初始化方法
@@ -47,10 +55,10 @@ class BaseActor(pykka.ThreadingActor, ABC):
             
             self._is_initialized = True
             self._status = "running"
-            self.logger.info(f"{self.__class__.__name__} Actor启动完成")
+            self.logger.info("%s Actor启动完成", self._class_name)
             
         except Exception as e:
-            self.logger.error(f"{self.__class__.__name__} Actor启动失败: {e}", exc_info=True)
+            self.logger.error("%s Actor启动失败: %s", self._class_name, e, exc_info=True)
             self._status = "error"
             raise
     
@@ -59,17 +67,17 @@ class BaseActor(pykka.ThreadingActor, ABC):
         Actor停止时调用
         """
         try:
-            self.logger.info(f"{self.__class__.__name__} Actor停止中...")
+            self.logger.info("%s Actor停止中...", self._class_name)
             self._status = "stopping"
             
             # 调用子类的清理方法
             self.cleanup()
             
             self._status = "stopped"
-            self.logger.info(f"{self.__class__.__name__} Actor已停止")
+            self.logger.info("%s Actor已停止", self._class_name)
             
         except Exception as e:
-            self.logger.error(f"{self.__class__.__name__} Actor停止失败: {e}", exc_info=True)
+            self.logger.error("%s Actor停止失败: %s", self._class_name, e, exc_info=True)
     
     def on_failure(self, exception_type, exception_value, traceback):
         """
@@ -81,7 +89,8 @@ class BaseActor(pykka.ThreadingActor, ABC):
             traceback: 异常追踪
         """
         self.logger.error(
-            f"{self.__class__.__name__} Actor发生异常: {exception_type.__name__}: {exception_value}",
+            "%s Actor发生异常: %s: %s",
+            self._class_name, exception_type.__name__, exception_value,
             exc_info=(exception_type, exception_value, traceback)
         )
         self._status = "error"
@@ -98,28 +107,35 @@ class BaseActor(pykka.ThreadingActor, ABC):
         """
         try:
             if not self._is_initialized:
-                self.logger.warning(f"Actor未初始化，忽略消息: {message}")
+                self.logger.warning("Actor未初始化，忽略消息: %s", message)
                 return {"status": "error", "message": "Actor未初始化"}
             
             # 处理通用消息
             if isinstance(message, dict):
-                action = message.get('action')
-                
-                if action == 'get_status':
-                    return self.get_status()
-                elif action == 'ping':
-                    return {"status": "ok", "message": "pong"}
-                elif action == 'stop':
-                    self.stop()
-                    return {"status": "ok", "message": "stopping"}
+                handler = self._base_handlers.get(message.get('action'))
+                if handler is not None:
+                    return handler(message)
             
             # 委托给子类处理
             return self.handle_message(message)
             
         except Exception as e:
-            self.logger.error(f"消息处理失败: {e}", exc_info=True)
+            self.logger.error("消息处理失败: %s", e, exc_info=True)
             return {"status": "error", "message": str(e)}
     
+    def _handle_get_status(self, message: dict) -> Dict[str, Any]:
+        """处理获取状态的消息"""
+        return self.get_status()
+    
+    def _handle_ping(self, message: dict) -> Dict[str, Any]:
+        """处理ping消息"""
+        return {"status": "ok", "message": "pong"}
+    
+    def _handle_stop(self, message: dict) -> Dict[str, Any]:
+        """处理停止消息"""
+        self.stop()
+        return {"status": "ok", "message": "stopping"}
+    
     @abstractmethod
     def initialize(self):
         """
@@ -155,15 +171,28 @@ class BaseActor(pykka.ThreadingActor, ABC):
             Dict[str, Any]: Actor状态信息
         """
         return {
-            "actor_name": self.__class__.__name__,
+            "actor_name": self._class_name,
             "status": self._status,
             "initialized": self._is_initialized,
             "actor_urn": str(self.actor_urn) if hasattr(self, 'actor_urn') else None
         }
     
+    def ask_actor(self, actor_ref: pykka.ActorRef, message: Any) -> pykka.Future:
+        """
+        向其他Actor发送请求，不阻塞当前Actor
+        
+        Args:
+            actor_ref: 目标Actor引用
+            message: 发送的消息
+            
+        Returns:
+            pykka.Future: 响应结果的Future，由调用方决定何时get()
+        """
+        return actor_ref.ask(message, block=False)
+    
     def send_to_actor(self, actor_ref: pykka.ActorRef, message: Any, timeout: float = 5.0) -> Optional[Any]:
         """
-        向其他Actor发送消息
+        向其他Actor发送消息并等待响应
         
         Args:
             actor_ref: 目标Actor引用
@@ -174,10 +203,9 @@ class BaseActor(pykka.ThreadingActor, ABC):
             Optional[Any]: 响应结果
         """
         try:
-            future = actor_ref.ask(message, timeout=timeout)
-            return future.get()
+            return self.ask_actor(actor_ref, message).get(timeout=timeout)
         except Exception as e:
-            self.logger.error(f"发送消息失败: {e}")
+            self.logger.error("发送消息失败: %s", e)
             return None
     
     def tell_actor(self, actor_ref: pykka.ActorRef, message: Any):
@@ -191,7 +219,7 @@ class BaseActor(pykka.ThreadingActor, ABC):
         try:
             actor_ref.tell(message)
         except Exception as e:
-            self.logger.error(f"发送单向消息失败: {e}")
+            self.logger.error("发送单向消息失败: %s", e)
     
     def broadcast_message(self, actor_refs: list, message: Any):
         """
@@ -205,4 +233,4 @@ class BaseActor(pykka.ThreadingActor, ABC):
             try:
                 actor_ref.tell(message)
             except Exception as e:
-                self.logger.error(f"广播消息失败: {e}") 
\ No newline at end of file
+                self.logger.error("广播消息失败: %s", e) 
\ No newline at end of file
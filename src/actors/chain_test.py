@@ -2,10 +2,16 @@
 测试基础对话链
 用于测试和演示level_base_chain.py的功能
 """
+import atexit
 import os
 import sys
 from dotenv import load_dotenv
 
+try:
+    import readline  # 为input()提供行编辑和历史记录（Windows上可能不可用）
+except ImportError:
+    readline = None
+
 # 添加项目根目录到Python路径
 current_dir = os.path.dirname(__file__)
 project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
@@ -33,6 +39,31 @@ def check_environment():
     print("✓ 环境检查通过")
 
 
+# 交互输入历史文件
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".pank_ins", "chain_test_history")
+
+
+def setup_input_history():
+    """加载输入历史，并在退出时保存（readline不可用时跳过）"""
+    if readline is None:
+        return
+    
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    
+    def save_history():
+        try:
+            os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+            readline.set_history_length(1000)
+            readline.write_history_file(HISTORY_FILE)
+        except OSError as e:
+            logger.warning(f"保存输入历史失败: {e}")
+    
+    atexit.register(save_history)
+
+
 def run_interactive_test():
     """运行交互式测试"""
     print("\n=== 基础对话链测试 ===")
@@ -47,6 +78,8 @@ def run_interactive_test():
     print("  /history - 显示对话历史")
     print("=" * 50)
     
+    setup_input_history()
+    
     # 创建基础对话链
     chain = LevelBaseChain()
     container_id = "test_user"  # 使用固定的测试用户ID
@@ -75,10 +108,12 @@ def run_interactive_test():
                     if not history:
                         print("暂无对话历史")
                     else:
-                        print("\n=== 对话历史 ===")
-                        for msg in history:
-                            role = "用户" if msg["role"] == "user" else "助手"
-                            print(f"{role}: {msg['content']}")
+                        # 拼接后一次性输出
+                        lines = [
+                            f"{'用户' if msg['role'] == 'user' else '助手'}: {msg['content']}"
+                            for msg in history
+                        ]
+                        print("\n=== 对话历史 ===\n" + "\n".join(lines))
                     continue
                     
                 else:
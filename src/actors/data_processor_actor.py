@@ -10,11 +10,52 @@
 @version: 1.0.0
 """
 
-from typing import Any
+import math
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
 import numpy as np
+from src.utils import json_utils
 from .base_actor import BaseActor
 
 
+# 内存中最多保留的已处理数据条数的默认值（配置项buf_cap），超出部分按从旧到新的顺序溢出到磁盘
+DATA_BUFFER_CAPACITY = 1024
+# 溢出数据文件的默认路径（配置项spill_file，每行一条JSON记录，只追加写入）
+SPILL_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "data_buffer_spill.ndjson"
+
+
+def _mean_std(x):
+    """
+    计算均值与标准差（均值只计算一次，方差由一次点积得到）
+    
+    @param {np.ndarray} x - 一维数值数组（非空）
+    @returns {tuple} (均值, 标准差, 方差)
+    """
+    mean = float(x.mean())
+    centered = x - mean
+    variance = float(np.dot(centered, centered)) / x.size
+    return mean, math.sqrt(variance), variance
+
+
+def _min_max_median(x):
+    """
+    通过一次多点选择(np.partition)同时得到最小值、最大值与中位数
+    
+    与np.min/np.max/np.median一致，含NaN时三个结果均为NaN
+    
+    @param {np.ndarray} x - 一维数值数组（非空）
+    @returns {tuple} (最小值, 最大值, 中位数)
+    """
+    last = x.size - 1
+    lo, hi = last // 2, x.size // 2
+    part = np.partition(x, (0, lo, hi, last))
+    # np.partition把NaN排在末尾，末位为NaN即说明数组中含NaN
+    if math.isnan(part[last]):
+        return math.nan, math.nan, math.nan
+    return float(part[0]), float(part[last]), float((part[lo] + part[hi]) / 2)
+
+
 class DataProcessorActor(BaseActor):
     """
     数据处理Actor
@@ -22,14 +63,36 @@ class DataProcessorActor(BaseActor):
     负责数据处理、分析和存储
     """
     
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        创建数据处理Actor
+        
+        @param {dict} config - Actor配置，可选项 buf_cap（缓冲区容量）、spill_file（溢出文件路径）
+        """
+        super().__init__()
+        self.config = config or {}
+    
     def initialize(self):
         """
         初始化数据处理Actor
         """
         self.logger.info("数据处理Actor初始化")
-        self.data_buffer = []
+        self.data_buffer = deque()
+        self._buffer_capacity = self.config.get('buf_cap', DATA_BUFFER_CAPACITY)
+        self._spill_file = Path(self.config.get('spill_file', SPILL_FILE))
         self.processing_queue = []
         
+        # 数据处理消息处理器映射（action -> 处理方法）
+        self._dispatch = {
+            'process_data': self._process_data,
+            'process_data_batch': self._process_data_batch,
+            'save_data': self._save_data,
+            'load_data': self._load_data,
+            'filter_data': self._filter_data,
+            'analyze_statistics': self._analyze_statistics,
+            'export_data': self._export_data,
+        }
+        
     def cleanup(self):
         """
         清理数据处理资源
@@ -38,6 +101,8 @@ class DataProcessorActor(BaseActor):
         # 保存未处理的数据
         if self.data_buffer:
             self.logger.info(f"保存 {len(self.data_buffer)} 条未处理数据")
+            self._spill_data(self.data_buffer)
+            self.data_buffer.clear()
         
     def handle_message(self, message) -> Any:
         """
@@ -47,20 +112,9 @@ class DataProcessorActor(BaseActor):
         @returns {Any} 处理结果
         """
         if isinstance(message, dict):
-            action = message.get('action')
-            
-            if action == 'process_data':
-                return self._process_data(message.get('data'))
-            elif action == 'save_data':
-                return self._save_data(message.get('data'))
-            elif action == 'load_data':
-                return self._load_data(message.get('data'))
-            elif action == 'filter_data':
-                return self._filter_data(message.get('data'))
-            elif action == 'analyze_statistics':
-                return self._analyze_statistics(message.get('data'))
-            elif action == 'export_data':
-                return self._export_data(message.get('data'))
+            handler = self._dispatch.get(message.get('action'))
+            if handler is not None:
+                return handler(message.get('data'))
             
         self.logger.warning(f"未知的数据处理消息: {message}")
         return {"status": "error", "message": "未知的数据处理消息"}
@@ -79,7 +133,7 @@ class DataProcessorActor(BaseActor):
             processed_data = self._preprocess_data(data)
             
             # 添加到缓冲区
-            self.data_buffer.append(processed_data)
+            self._buffer_data((processed_data,))
             
             return {"status": "ok", "data": processed_data, "message": "数据处理完成"}
             
@@ -87,6 +141,69 @@ class DataProcessorActor(BaseActor):
             self.logger.error(f"数据处理失败: {e}")
             return {"status": "error", "message": f"数据处理失败: {e}"}
     
+    def _process_data_batch(self, data):
+        """
+        批量处理数据（一条消息携带多帧数据，分摊消息投递开销）
+        
+        @param {dict} data - 批量数据，格式为 {'batch': [帧1, 帧2, ...]}
+        @returns {dict} 处理结果
+        """
+        batch = (data or {}).get('batch', [])
+        self.logger.info("开始批量处理数据: %d 帧", len(batch))
+        
+        try:
+            processed_batch = [self._preprocess_data(frame) for frame in batch]
+            
+            # 一次性加入缓冲区
+            self._buffer_data(processed_batch)
+            
+            return {"status": "ok", "data": processed_batch, "message": f"批量处理完成: {len(processed_batch)} 帧"}
+            
+        except Exception as e:
+            self.logger.error(f"批量数据处理失败: {e}")
+            return {"status": "error", "message": f"批量数据处理失败: {e}"}
+    
+    def _buffer_data(self, entries):
+        """
+        将已处理数据加入缓冲区，超出容量时把最旧的数据移出并溢出到磁盘
+        
+        溢出失败不影响缓冲区容量限制，也不抛出异常，调用方无需重试
+        
+        @param {Iterable[dict]} entries - 已处理的数据
+        """
+        self.data_buffer.extend(entries)
+        
+        overflow = len(self.data_buffer) - self._buffer_capacity
+        if overflow > 0:
+            self._spill_data([self.data_buffer.popleft() for _ in range(overflow)])
+    
+    def _spill_data(self, entries):
+        """
+        以NDJSON格式逐条追加写入溢出文件
+        
+        无法序列化的条目记录日志后丢弃，不影响其他条目；
+        溢出文件无法写入时记录日志并丢弃剩余条目
+        
+        @param {Iterable[dict]} entries - 要写入磁盘的数据
+        @returns {int} 成功写入的条数
+        """
+        entries = list(entries)
+        written = 0
+        try:
+            self._spill_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._spill_file, "ab") as f:
+                for entry in entries:
+                    try:
+                        line = json_utils.dumps(entry) + b"\n"
+                    except (TypeError, ValueError) as e:
+                        self.logger.error("溢出数据无法序列化，已丢弃: %s", e)
+                        continue
+                    f.write(line)
+                    written += 1
+        except OSError as e:
+            self.logger.error("溢出文件写入失败，未写入的 %d 条数据已丢弃: %s", len(entries) - written, e)
+        return written
+    
     def _preprocess_data(self, data):
         """
         数据预处理
@@ -96,16 +213,19 @@ class DataProcessorActor(BaseActor):
         """
         processed = data.copy()
         
-        # 示例预处理步骤
-        if 'channel_1' in data and data['channel_1']:
-            # 使用numpy进行数值处理
-            ch1_data = np.array(data['channel_1'])
+        # 示例预处理步骤（通道数据可以是列表或numpy数组）
+        channel_1 = data.get('channel_1')
+        if channel_1 is not None and len(channel_1):
+            # 统一为连续的float64数组，归约走numpy的类型化快速路径
+            ch1_data = np.ascontiguousarray(channel_1, dtype=np.float64)
+            mean, std, _ = _mean_std(ch1_data)
             processed['channel_1_processed'] = {
-                'raw': ch1_data.tolist(),
-                'mean': float(np.mean(ch1_data)) if len(ch1_data) > 0 else 0,
-                'std': float(np.std(ch1_data)) if len(ch1_data) > 0 else 0,
-                'max': float(np.max(ch1_data)) if len(ch1_data) > 0 else 0,
-                'min': float(np.min(ch1_data)) if len(ch1_data) > 0 else 0
+                # 直接引用原始数据，避免tolist()重新生成整个列表
+                'raw': channel_1,
+                'mean': mean,
+                'std': std,
+                'max': float(ch1_data.max()),
+                'min': float(ch1_data.min())
             }
         
         return processed
@@ -195,16 +315,20 @@ class DataProcessorActor(BaseActor):
                 return {"status": "error", "message": "没有数据可分析"}
             
             # 使用numpy进行统计分析
-            np_data = np.array(input_data)
+            np_data = np.asarray(input_data, dtype=np.float64)
+            # 多维数据按展平后的全部元素统计，count仍为第一维长度
+            values = np_data.ravel()
+            mean, std, variance = _mean_std(values)
+            min_value, max_value, median = _min_max_median(values)
             
             statistics = {
                 'count': len(np_data),
-                'mean': float(np.mean(np_data)),
-                'std': float(np.std(np_data)),
-                'min': float(np.min(np_data)),
-                'max': float(np.max(np_data)),
-                'median': float(np.median(np_data)),
-                'variance': float(np.var(np_data))
+                'mean': mean,
+                'std': std,
+                'min': min_value,
+                'max': max_value,
+                'median': median,
+                'variance': variance
             }
             
             return {"status": "ok", "data": statistics}
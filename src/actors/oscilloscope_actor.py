@@ -11,6 +11,7 @@
 """
 
 from typing import Any
+import numpy as np
 from .base_actor import BaseActor
 
 
@@ -30,6 +31,16 @@ class OscilloscopeActor(BaseActor):
         self.device_settings = {}
         # 示波器驱动相关的初始化，后续导入
         
+        # 示波器消息处理器映射（action -> 处理方法，参数为消息中的data）
+        self._dispatch = {
+            'connect': self._connect_device,
+            'disconnect': lambda data: self._disconnect_device(),
+            'configure': self._configure_device,
+            'acquire_data': self._acquire_data,
+            'send_command': self._send_command,
+            'get_device_info': lambda data: self._get_device_info(),
+        }
+        
     def cleanup(self):
         """
         清理示波器资源
@@ -46,20 +57,9 @@ class OscilloscopeActor(BaseActor):
         @returns {Any} 处理结果
         """
         if isinstance(message, dict):
-            action = message.get('action')
-            
-            if action == 'connect':
-                return self._connect_device(message.get('data'))
-            elif action == 'disconnect':
-                return self._disconnect_device()
-            elif action == 'configure':
-                return self._configure_device(message.get('data'))
-            elif action == 'acquire_data':
-                return self._acquire_data(message.get('data'))
-            elif action == 'send_command':
-                return self._send_command(message.get('data'))
-            elif action == 'get_device_info':
-                return self._get_device_info()
+            handler = self._dispatch.get(message.get('action'))
+            if handler is not None:
+                return handler(message.get('data'))
             
         self.logger.warning(f"未知的示波器消息: {message}")
         return {"status": "error", "message": "未知的示波器消息"}
@@ -139,9 +139,11 @@ class OscilloscopeActor(BaseActor):
         try:
             # 这里后续会集成实际的数据采集逻辑
             # 目前返回模拟数据
+            # 通道数据以float64 ndarray传递：Actor运行在同一进程内，数组按引用传给
+            # DataProcessorActor，无需list与ndarray之间的往返转换
             sample_data = {
-                "channel_1": [],
-                "channel_2": [],
+                "channel_1": np.empty(0, dtype=np.float64),
+                "channel_2": np.empty(0, dtype=np.float64),
                 "time_scale": "1ms",
                 "voltage_scale": "1V",
                 "sample_rate": 1000000,
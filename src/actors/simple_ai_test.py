@@ -7,7 +7,9 @@
 """
 
 import os
+import re
 import sys
+from types import MappingProxyType
 
 # 添加项目根目录到Python路径
 current_dir = os.path.dirname(__file__)
@@ -26,6 +28,43 @@ setup_logging(
 )
 logger = get_logger(__name__)
 
+# 关键词 -> 消息类别
+_KEYWORD_TAGS = {
+    "你好": "greeting",
+    "hello": "greeting",
+    "示波器": "oscilloscope",
+    "测试": "test",
+    "help": "help",
+    "帮助": "help",
+}
+
+# 所有关键词预编译为一个正则，一次扫描得到消息命中的全部类别
+_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in _KEYWORD_TAGS),
+    re.IGNORECASE
+)
+
+
+# 各类别的固定回复，按优先级排列（只读）
+_RESPONSES = MappingProxyType({
+    "greeting": "你好！我是示波器AI助手，可以帮助您进行测量和分析。",
+    "oscilloscope": "我可以帮助您操作示波器，包括设置通道、触发、测量频率等功能。",
+    "test": "系统正在正常运行，所有模块导入成功！您可以进行各种测试。",
+    "help": """我可以帮助您：
+1. 示波器操作和设置
+2. 信号测量和分析  
+3. 测试流程规划
+4. 数据记录和导出
+请告诉我您需要什么帮助？""",
+})
+
+_DEFAULT_RESPONSE = "收到您的消息：{message}。这是一个模拟回复，实际AI功能需要配置API密钥后才能使用。"
+
+
+def _match_tags(message: str) -> set:
+    """返回消息中命中的关键词类别"""
+    return {_KEYWORD_TAGS[match.group().lower()] for match in _KEYWORD_PATTERN.finditer(message)}
+
 
 class SimpleAIChat:
     """简化的AI聊天类"""
@@ -39,28 +78,20 @@ class SimpleAIChat:
         """处理用户消息（模拟版本）"""
         try:
             # 如果容器不存在，创建新容器
-            if container_id not in self.history_manager.get_all_container_ids():
+            if not self.history_manager.has_container(container_id):
                 self.history_manager.create_container(container_id)
             
             # 添加用户消息到历史
             self.history_manager.add_message(container_id, "user", message)
             
             # 模拟AI回复
-            if "你好" in message or "hello" in message.lower():
-                response = "你好！我是示波器AI助手，可以帮助您进行测量和分析。"
-            elif "示波器" in message:
-                response = "我可以帮助您操作示波器，包括设置通道、触发、测量频率等功能。"
-            elif "测试" in message:
-                response = "系统正在正常运行，所有模块导入成功！您可以进行各种测试。"
-            elif "help" in message.lower() or "帮助" in message:
-                response = """我可以帮助您：
-1. 示波器操作和设置
-2. 信号测量和分析  
-3. 测试流程规划
-4. 数据记录和导出
-请告诉我您需要什么帮助？"""
-            else:
-                response = f"收到您的消息：{message}。这是一个模拟回复，实际AI功能需要配置API密钥后才能使用。"
+            tags = _match_tags(message)
+            response = next(
+                (_RESPONSES[tag] for tag in _RESPONSES if tag in tags),
+                None
+            )
+            if response is None:
+                response = _DEFAULT_RESPONSE.format(message=message)
             
             # 添加助手回复到历史
             self.history_manager.add_message(container_id, "assistant", response)
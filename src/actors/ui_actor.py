@@ -11,13 +11,19 @@ UI Actor模块
 """
 
 import logging
+import sys
+import threading
 from typing import Any, Dict, Optional
-from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtCore import QObject, Qt, Signal, QTimer
 from PySide6.QtWidgets import QApplication
 import pykka
 from .base_actor import BaseActor
 
 
+# 流式片段合并刷新的间隔（毫秒，约一帧）
+STREAM_FLUSH_INTERVAL_MS = 16
+
+
 class UIActorSignals(QObject):
     """UI Actor的Qt信号类"""
     
@@ -31,7 +37,14 @@ class UIActorSignals(QObject):
     
     # 数据显示信号
     data_display = Signal(dict)
+    data_display_pending = Signal()  # 有待显示的最新数据帧
     log_message = Signal(str, str)  # level, message
+    
+    # AI流式更新信号
+    ai_stream_event = Signal(str, object)  # event_type, data
+    
+    # AI Actor注册完成信号
+    ai_actor_ready = Signal(object)  # ai_actor_ref
 
 
 class UIActor(BaseActor):
@@ -48,8 +61,44 @@ class UIActor(BaseActor):
         self.signals = UIActorSignals()
         self._setup_signals()
         
-        # 存储其他Actor的引用
+        # 存储其他Actor的引用（Actor停止后在查找时或通过unregister_actor移除）
         self.registered_actors = {}
+        # AI Actor是最常用的目标，单独缓存其引用
+        self._ai_ref = None
+        
+        # 消息处理器映射（action -> 处理方法）
+        # 处理方法统一接收完整消息，只取自己需要的字段
+        self._dispatch = {
+            'start_main_window': self._handle_start_main_window,
+            'close_main_window': self._handle_close_main_window,
+            'show_status': self._handle_show_status,
+            'show_message': self._handle_show_message,
+            'add_log': self._handle_add_log,
+            'display_data': self._handle_display_data,
+            'register_actor': self._handle_register_actor,
+            'unregister_actor': self._handle_unregister_actor,
+            'forward_to_actor': self._handle_forward_to_actor,
+            'set_ai_actor_ref': self._handle_set_ai_actor_ref,
+            # AI Actor发来的流式更新
+            'ai_chat_update_stream': self._handle_ai_chat_update_stream,
+            # 发送AI对话消息的请求
+            'ai_chat_send_message': self._handle_ai_chat_send_message,
+            # AI Actor发来的流程卡片更新
+            'flow_card_update': self._handle_flow_card_update,
+        }
+        
+        # 待刷新到界面的流式片段：一帧内到达的片段合并为一次界面更新
+        self._stream_chunks = []
+        self._stream_lock = threading.Lock()
+        # 合并刷新定时器属于主线程，只在主线程中启动
+        self._stream_flush_timer = QTimer()
+        self._stream_flush_timer.setSingleShot(True)
+        self._stream_flush_timer.setInterval(STREAM_FLUSH_INTERVAL_MS)
+        self._stream_flush_timer.timeout.connect(self._flush_stream_chunks)
+        
+        # 待显示的最新数据帧：主线程取走之前到达的新帧直接覆盖旧帧
+        self._latest_display_data = None
+        self._display_lock = threading.Lock()
     
     def initialize(self):
         """初始化UI Actor"""
@@ -64,70 +113,48 @@ class UIActor(BaseActor):
             self.main_window.close()
             self.main_window = None
         self.registered_actors.clear()
+        self._ai_ref = None
     
     def _setup_signals(self):
         """设置信号连接"""
         self.signals.show_main_window.connect(self._show_main_window)
         self.signals.close_main_window.connect(self._close_main_window)
         self.signals.log_message.connect(self._add_log_message)
+        self.signals.data_display_pending.connect(self._flush_display_data)
+        # 流式更新通过排队连接投递到主线程执行
+        self.signals.ai_stream_event.connect(self._on_ai_stream_event, Qt.QueuedConnection)
+        # AI Actor引用可能在后台线程注册，通过排队连接交给主线程中的主窗口
+        self.signals.ai_actor_ready.connect(self._on_ai_actor_ready, Qt.QueuedConnection)
     
     def handle_message(self, message) -> Any:
         """
         处理接收到的消息
         
+        处理方法抛出的异常由BaseActor.on_receive统一捕获并记录
+        
         Args:
             message: 接收到的消息
             
         Returns:
             Any: 处理结果
         """
-        try:
-            if isinstance(message, dict):
-                action = message.get('action')
-                
-                if action == 'start_main_window':
-                    return self._handle_start_main_window(message)
-                elif action == 'close_main_window':
-                    return self._handle_close_main_window()
-                elif action == 'show_status':
-                    return self._handle_show_status(message.get('data', {}))
-                elif action == 'show_message':
-                    return self._handle_show_message(message.get('text', ''))
-                elif action == 'add_log':
-                    return self._handle_add_log(message.get('level', 'INFO'), message.get('text', ''))
-                elif action == 'display_data':
-                    return self._handle_display_data(message.get('data', {}))
-                elif action == 'register_actor':
-                    return self._handle_register_actor(message)
-                elif action == 'forward_to_actor':
-                    return self._handle_forward_to_actor(message)
-                elif action == 'set_ai_actor_ref':
-                    return self._handle_set_ai_actor_ref(message)
-                elif action == 'ai_chat_update_stream':
-                    # 处理AI Actor发来的流式更新
-                    return self._handle_ai_chat_update_stream(message)
-                elif action == 'ai_chat_send_message':
-                    # 处理发送AI对话消息的请求
-                    return self._handle_ai_chat_send_message(message)
-                elif action == 'flow_card_update':
-                    # 处理AI Actor发来的流程卡片更新
-                    return self._handle_flow_card_update(message)
-                else:
-                    self.logger.warning(f"未知的消息类型: {action}")
-                    return {"status": "error", "message": f"未知的消息类型: {action}"}
-            else:
-                self.logger.warning(f"无效的消息格式: {type(message)}")
-                return {"status": "error", "message": "无效的消息格式"}
-                
-        except Exception as e:
-            self.logger.error(f"消息处理异常: {e}", exc_info=True)
-            return {"status": "error", "message": str(e)}
+        if not isinstance(message, dict):
+            self.logger.warning("无效的消息格式: %s", type(message))
+            return {"status": "error", "message": "无效的消息格式"}
+        
+        action = message.get('action')
+        handler = self._dispatch.get(action)
+        if handler is not None:
+            return handler(message)
+        
+        self.logger.warning("未知的消息类型: %s", action)
+        return {"status": "error", "message": f"未知的消息类型: {action}"}
     
     def _handle_start_main_window(self, message) -> Dict[str, Any]:
         """处理启动主窗口的消息"""
         try:
             username = message.get('username', None)
-            self.logger.info(f"启动主窗口，用户: {username}")
+            self.logger.info("启动主窗口，用户: %s", username)
             
             # 通过信号启动主窗口（线程安全）
             self.signals.show_main_window.emit()
@@ -139,10 +166,10 @@ class UIActor(BaseActor):
             return {"status": "ok", "message": "主窗口启动成功"}
             
         except Exception as e:
-            self.logger.error(f"启动主窗口失败: {e}")
+            self.logger.error("启动主窗口失败: %s", e)
             return {"status": "error", "message": str(e)}
     
-    def _handle_close_main_window(self) -> Dict[str, Any]:
+    def _handle_close_main_window(self, message) -> Dict[str, Any]:
         """处理关闭主窗口的消息"""
         try:
             self.logger.info("关闭主窗口")
@@ -151,51 +178,70 @@ class UIActor(BaseActor):
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def _handle_show_status(self, status_data) -> Dict[str, Any]:
+    def _handle_show_status(self, message) -> Dict[str, Any]:
         """处理显示状态的消息"""
         try:
-            self.signals.status_update.emit("status_update", status_data)
+            self.signals.status_update.emit("status_update", message.get('data', {}))
             return {"status": "ok", "message": "状态更新成功"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def _handle_show_message(self, text) -> Dict[str, Any]:
+    def _handle_show_message(self, message) -> Dict[str, Any]:
         """处理显示消息的消息"""
         try:
-            self.signals.message_received.emit(text)
+            self.signals.message_received.emit(message.get('text', ''))
             return {"status": "ok", "message": "消息显示成功"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def _handle_add_log(self, level, text) -> Dict[str, Any]:
+    def _handle_add_log(self, message) -> Dict[str, Any]:
         """处理添加日志的消息"""
         try:
-            self.signals.log_message.emit(level, text)
+            self.signals.log_message.emit(message.get('level', 'INFO'), message.get('text', ''))
             return {"status": "ok", "message": "日志添加成功"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def _handle_display_data(self, data) -> Dict[str, Any]:
-        """处理显示数据的消息"""
+    def _handle_display_data(self, message) -> Dict[str, Any]:
+        """
+        处理显示数据的消息
+        
+        只保留最新一帧：主线程尚未取走上一帧时直接覆盖，
+        生产速度超过界面刷新速度时丢弃过时的中间帧
+        """
         try:
-            self.signals.data_display.emit(data)
+            data = message.get('data', {})
+            with self._display_lock:
+                already_pending = self._latest_display_data is not None
+                self._latest_display_data = data
+            
+            if not already_pending:
+                self.signals.data_display_pending.emit()
             return {"status": "ok", "message": "数据显示成功"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
     def _handle_register_actor(self, message) -> Dict[str, Any]:
         """处理注册Actor的消息"""
+        return self.register_actor(message.get('actor_name'), message.get('actor_ref'))
+    
+    def register_actor(self, actor_name: str, actor_ref) -> Dict[str, Any]:
+        """
+        注册其他Actor的引用（可通过proxy直接调用）
+        
+        Args:
+            actor_name (str): Actor名称
+            actor_ref: Actor引用
+        """
         try:
-            actor_name = message.get('actor_name')
-            actor_ref = message.get('actor_ref')
-            
             if actor_name and actor_ref:
                 self.registered_actors[actor_name] = actor_ref
-                self.logger.info(f"注册Actor: {actor_name}")
+                self.logger.info("注册Actor: %s", actor_name)
                 
-                # 如果主窗口已创建且是AI Actor，设置引用
-                if actor_name == 'ai' and self.main_window:
-                    self.main_window.set_ai_actor_ref(actor_ref)
+                if actor_name == 'ai':
+                    self._ai_ref = actor_ref
+                    # 主窗口在主线程中创建和访问，引用通过信号交给主线程设置
+                    self.signals.ai_actor_ready.emit(actor_ref)
                 
                 return {"status": "ok", "message": f"Actor {actor_name} 注册成功"}
             else:
@@ -204,27 +250,63 @@ class UIActor(BaseActor):
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    def _handle_unregister_actor(self, message) -> Dict[str, Any]:
+        """处理注销Actor的消息"""
+        return self.unregister_actor(message.get('actor_name'))
+    
+    def unregister_actor(self, actor_name: str) -> Dict[str, Any]:
+        """
+        注销已注册的Actor引用（Actor停止时调用）
+        
+        Args:
+            actor_name (str): Actor名称
+        """
+        if self.registered_actors.pop(actor_name, None) is None:
+            return {"status": "error", "message": f"Actor {actor_name} 未注册"}
+        
+        if actor_name == 'ai':
+            self._ai_ref = None
+        self.logger.info("注销Actor: %s", actor_name)
+        return {"status": "ok", "message": f"Actor {actor_name} 注销成功"}
+    
+    def _get_live_actor(self, actor_name: str):
+        """
+        获取仍在运行的已注册Actor引用
+        
+        已停止但未注销的Actor在这里注销，不会一直保留在registered_actors中
+        
+        Args:
+            actor_name (str): Actor名称
+            
+        Returns:
+            Actor引用，未注册或已停止时为None
+        """
+        actor_ref = self.registered_actors.get(actor_name)
+        if actor_ref is not None and not actor_ref.is_alive():
+            self.unregister_actor(actor_name)
+            return None
+        return actor_ref
+    
     def _handle_forward_to_actor(self, message) -> Dict[str, Any]:
         """处理转发消息到其他Actor的请求"""
         try:
             target_actor = message.get('target_actor')
             forward_message = message.get('message')
             
-            if target_actor in self.registered_actors:
-                actor_ref = self.registered_actors[target_actor]
-                
-                # 根据消息类型选择发送方式
-                if message.get('wait_response', False):
-                    # 等待响应
-                    timeout = message.get('timeout', 5.0)
-                    result = actor_ref.ask(forward_message, timeout=timeout)
-                    return {"status": "ok", "result": result}
-                else:
-                    # 不等待响应
-                    actor_ref.tell(forward_message)
-                    return {"status": "ok", "message": "消息已发送"}
-            else:
+            actor_ref = self._get_live_actor(target_actor)
+            if actor_ref is None:
                 return {"status": "error", "message": f"Actor {target_actor} 未注册"}
+            
+            # 根据消息类型选择发送方式
+            if not message.get('wait_response', False):
+                # 不等待响应（最常见的情况）
+                actor_ref.tell(forward_message)
+                return {"status": "ok", "message": "消息已发送"}
+            
+            # 等待响应
+            timeout = message.get('timeout', 5.0)
+            result = actor_ref.ask(forward_message, timeout=timeout)
+            return {"status": "ok", "result": result}
                 
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -250,43 +332,70 @@ class UIActor(BaseActor):
             event_type = message.get('event_type')
             data = message.get('data')
             
-            self.logger.info(f"收到流式更新 - 事件类型: {event_type}")
+            self.logger.debug("收到流式更新 - 事件类型: %s", event_type)
             
             # 🔥 修改：使用Qt信号确保在主线程中更新UI - 适配QML主窗口的画布布局
             if self.main_window:
-                # 🔥 修改：使用直接调用方法而不是QMetaObject.invokeMethod
-                from PySide6.QtCore import QTimer
-                
-                def call_in_main_thread():
-                    """在主线程中执行UI更新"""
-                    try:
-                        if event_type == "START_STREAM":
-                            # 🔥 直接调用方法
-                            self.main_window.start_stream_response()
-                            self.main_window.set_ai_chat_streaming_state(True)
-                            
-                        elif event_type == "STREAM_CHUNK":
-                            # 🔥 直接调用方法
-                            self.main_window.append_stream_chunk(data)
-                            self.main_window.maintain_ai_chat_scroll_position()
-                            
-                        elif event_type == "END_STREAM":
-                            # 🔥 直接调用方法
-                            self.main_window.finish_stream_response()
-                            self.main_window.set_ai_chat_streaming_state(False)
-                            
-                    except Exception as e:
-                        self.logger.error(f"主线程UI更新失败: {e}")
+                if event_type == "STREAM_CHUNK":
+                    # 片段先进入缓冲区，只有缓冲区由空变为非空时才通知主线程
+                    with self._stream_lock:
+                        self._stream_chunks.append(data)
+                        if len(self._stream_chunks) > 1:
+                            return {"status": "ok", "message": "流式更新处理成功"}
                 
-                # 使用QTimer.singleShot确保在主线程中执行
-                QTimer.singleShot(0, call_in_main_thread)
+                self.signals.ai_stream_event.emit(event_type, data)
             
             return {"status": "ok", "message": "流式更新处理成功"}
             
         except Exception as e:
-            self.logger.error(f"处理流式更新失败: {e}")
+            self.logger.error("处理流式更新失败: %s", e)
             return {"status": "error", "message": str(e)}
     
+    def _on_ai_stream_event(self, event_type, data):
+        """执行流式更新（在主线程中执行）"""
+        if event_type == "STREAM_CHUNK":
+            # 一帧内到达的片段由定时器合并刷新；无论主窗口此时是否存在都启动定时器，
+            # 保证缓冲区总会被清空，之后到达的片段才能再次通知主线程
+            if not self._stream_flush_timer.isActive():
+                self._stream_flush_timer.start()
+            return
+        
+        if not self.main_window:
+            return
+        
+        try:
+            if event_type == "START_STREAM":
+                self.main_window.start_stream_response()
+                self.main_window.set_ai_chat_streaming_state(True)
+                
+            elif event_type == "END_STREAM":
+                # 先同步刷新剩余片段，再结束流式响应
+                self._stream_flush_timer.stop()
+                self._flush_stream_chunks()
+                self.main_window.finish_stream_response()
+                self.main_window.set_ai_chat_streaming_state(False)
+                
+        except Exception as e:
+            self.logger.error("主线程UI更新失败: %s", e)
+    
+    def _flush_stream_chunks(self):
+        """
+        将缓冲的流式片段合并后一次性追加到界面（在主线程中执行）
+        
+        主窗口不存在时同样清空缓冲区（丢弃片段），避免片段滞留导致后续片段不再触发刷新
+        """
+        with self._stream_lock:
+            chunks, self._stream_chunks = self._stream_chunks, []
+        
+        if not chunks or not self.main_window:
+            return
+        
+        try:
+            self.main_window.append_stream_chunk(''.join(chunks))
+            self.main_window.maintain_ai_chat_scroll_position()
+        except Exception as e:
+            self.logger.error("主线程UI更新失败: %s", e)
+    
     def _handle_ai_chat_send_message(self, message) -> Dict[str, Any]:
         """处理发送AI对话消息的请求"""
         try:
@@ -296,11 +405,11 @@ class UIActor(BaseActor):
             if not user_message:
                 return {"status": "error", "message": "消息文本为空"}
             
-            self.logger.info(f"发送AI对话消息: {user_message}")
+            self.logger.info("发送AI对话消息: %s", user_message)
             
             # 转发给AI Actor处理
-            if 'ai' in self.registered_actors:
-                ai_actor_ref = self.registered_actors['ai']
+            ai_actor_ref = self._ai_ref
+            if ai_actor_ref is not None:
                 ai_message = {
                     'action': 'process_message_stream',
                     'container_id': container_id,
@@ -312,7 +421,7 @@ class UIActor(BaseActor):
                 return {"status": "error", "message": "AI Actor未注册"}
                 
         except Exception as e:
-            self.logger.error(f"发送AI对话消息失败: {e}")
+            self.logger.error("发送AI对话消息失败: %s", e)
             return {"status": "error", "message": str(e)}
     
     def _handle_flow_card_update(self, message) -> Dict[str, Any]:
@@ -321,7 +430,7 @@ class UIActor(BaseActor):
             event_type = message.get('event_type')
             data = message.get('data')
             
-            self.logger.info(f"收到流程卡片更新 - 事件类型: {event_type}")
+            self.logger.info("收到流程卡片更新 - 事件类型: %s", event_type)
             
             # 适配QML主窗口的缓冲系统
             if self.main_window:
@@ -335,7 +444,7 @@ class UIActor(BaseActor):
             return {"status": "ok", "message": "流程卡片更新处理成功"}
             
         except Exception as e:
-            self.logger.error(f"处理流程卡片更新失败: {e}")
+            self.logger.error("处理流程卡片更新失败: %s", e)
             return {"status": "error", "message": str(e)}
     
     def _show_main_window(self):
@@ -353,8 +462,8 @@ class UIActor(BaseActor):
                 self.main_window.set_ui_actor_ref(self.actor_ref)
                 
                 # 如果AI Actor已注册，设置引用
-                if 'ai' in self.registered_actors:
-                    self.main_window.set_ai_actor_ref(self.registered_actors['ai'])
+                if self._ai_ref is not None:
+                    self.main_window.set_ai_actor_ref(self._ai_ref)
             
             # 显示窗口并激活到前台
             self.main_window.show()
@@ -364,7 +473,13 @@ class UIActor(BaseActor):
             self.logger.info("QML主窗口显示成功")
             
         except Exception as e:
-            self.logger.error(f"显示QML主窗口失败: {e}")
+            self.logger.error("显示QML主窗口失败: %s", e)
+    
+    def _on_ai_actor_ready(self, ai_actor_ref):
+        """AI Actor注册完成后设置到主窗口（在主线程中执行）"""
+        # 主窗口尚未创建时，_show_main_window会从_ai_ref中取得引用
+        if self.main_window:
+            self.main_window.set_ai_actor_ref(ai_actor_ref)
     
     def _close_main_window(self):
         """关闭主窗口（在主线程中执行）"""
@@ -374,7 +489,7 @@ class UIActor(BaseActor):
                 self.main_window = None
             self.logger.info("主窗口关闭成功")
         except Exception as e:
-            self.logger.error(f"关闭主窗口失败: {e}")
+            self.logger.error("关闭主窗口失败: %s", e)
     
     def _add_log_message(self, level, text):
         """添加日志消息（在主线程中执行）"""
@@ -382,7 +497,15 @@ class UIActor(BaseActor):
             if self.main_window and hasattr(self.main_window, 'qml_bridge'):
                 self.main_window.qml_bridge.add_log(level, text)
         except Exception as e:
-            self.logger.error(f"添加日志消息失败: {e}")
+            self.logger.error("添加日志消息失败: %s", e)
+    
+    def _flush_display_data(self):
+        """取出最新数据帧并发出显示信号（在主线程中执行）"""
+        with self._display_lock:
+            data, self._latest_display_data = self._latest_display_data, None
+        
+        if data is not None:
+            self.signals.data_display.emit(data)
     
     def _on_window_closed(self):
         """当窗口被关闭时的回调"""
@@ -396,46 +519,42 @@ class UIActor(BaseActor):
             # 停止所有已注册的Actor
             for actor_name, actor_ref in self.registered_actors.items():
                 try:
-                    self.logger.info(f"🛑 停止 {actor_name} Actor...")
+                    self.logger.info("🛑 停止 %s Actor...", actor_name)
                     actor_ref.stop()
-                    self.logger.info(f"✅ {actor_name} Actor已停止")
+                    self.logger.info("✅ %s Actor已停止", actor_name)
                 except Exception as e:
-                    self.logger.error(f"❌ 停止 {actor_name} Actor失败: {e}")
+                    self.logger.error("❌ 停止 %s Actor失败: %s", actor_name, e)
             
             # 清空注册的Actor列表
             self.registered_actors.clear()
+            self._ai_ref = None
             
             # 停止自己（UI Actor）
             self.logger.info("🛑 停止UI Actor...")
             
             # 使用QTimer延迟停止，确保日志记录完成
-            from PySide6.QtCore import QTimer
             def delayed_shutdown():
                 try:
                     # 停止整个pykka Actor系统
-                    import pykka
                     pykka.ActorRegistry.stop_all()
                     self.logger.info("✅ 所有Actor已停止")
                     
                     # 退出QApplication
-                    from PySide6.QtWidgets import QApplication
                     if QApplication.instance():
                         QApplication.instance().quit()
                         self.logger.info("✅ 应用程序已退出")
                         
                 except Exception as e:
-                    self.logger.error(f"❌ 延迟关闭过程中出错: {e}")
+                    self.logger.error("❌ 延迟关闭过程中出错: %s", e)
                     # 强制退出
-                    import sys
                     sys.exit(0)
                     
             # 延迟500ms执行关闭，确保日志有时间写入
             QTimer.singleShot(500, delayed_shutdown)
             
         except Exception as e:
-            self.logger.error(f"❌ 清理Actor系统失败: {e}")
+            self.logger.error("❌ 清理Actor系统失败: %s", e)
             # 出现异常时强制退出
-            import sys
             sys.exit(1)
     
     def get_main_window(self):
@@ -456,16 +575,17 @@ class UIActor(BaseActor):
             wait_response (bool): 是否等待响应
             timeout (float): 超时时间
         """
-        if actor_name in self.registered_actors:
+        actor_ref = self._get_live_actor(actor_name)
+        if actor_ref is not None:
             try:
                 if wait_response:
-                    return self.registered_actors[actor_name].ask(message, timeout=timeout)
+                    return actor_ref.ask(message, timeout=timeout)
                 else:
-                    self.registered_actors[actor_name].tell(message)
+                    actor_ref.tell(message)
                     return True
             except Exception as e:
-                self.logger.error(f"发送消息到 {actor_name} 失败: {e}")
+                self.logger.error("发送消息到 %s 失败: %s", actor_name, e)
                 return False
         else:
-            self.logger.warning(f"Actor {actor_name} 未注册")
+            self.logger.warning("Actor %s 未注册", actor_name)
             return False
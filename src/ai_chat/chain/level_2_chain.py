@@ -139,15 +139,17 @@ class Level2Chain:
         def plan_reason(data):
             """计划调整"""
             print("\n正在规划测试指令...")
-            response = ""
+            chunks = []  # 流式片段先收集，结束后一次拼接
 
             # 添加用户消息到历史（只添加字符串）
             self.history_manager.add_message(self.container_id, "user", data)
+            # get_history直接返回容器内的列表引用，不复制历史
             history_message = self.history_manager.get_history(self.container_id)
             for chunk in self.instruction_parser_llm.chat_get_response_stream(history_message):
                 print(chunk, end="", flush=True)
-                response += chunk
+                chunks.append(chunk)
             print("\n")
+            response = "".join(chunks)
             
             logger.debug(f"指令解析响应: {response}")
             # 添加助手消息到历史
@@ -170,10 +172,6 @@ class Level2Chain:
         def single_step_processor(data):
             """单步处理器 - 处理当前步骤"""
             # 确保data是字典类型
-            if isinstance(data, tuple):
-                logger.warning(f"single_step_processor收到tuple类型数据: {data}")
-                data = data[0] if len(data) > 0 and isinstance(data[0], dict) else {}
-            
             if not isinstance(data, dict):
                 logger.error(f"single_step_processor收到非字典数据: {type(data)} - {data}")
                 return {"status": "error", "results": "数据格式错误"}
@@ -216,10 +214,6 @@ class Level2Chain:
             
         def plan_continue_condition(data, iteration):
             """计划继续条件"""
-            # 检查data是否为tuple类型，如果是则提取其中的data参数
-            if isinstance(data, tuple):
-                data = data[0] if len(data) > 0 else {}
-            
             if data.get("status", "running") == "completed":
                 return False
             else:
@@ -227,10 +221,8 @@ class Level2Chain:
         
         def format_final_result(data):
             """格式化最终结果"""
-            if isinstance(data, tuple):
-                data1 = data[0][0] if len(data) > 0 else {}
-            if data1.get("status", "running") == "completed" :
-                return data1.get("results", [])
+            if data.get("status", "running") == "completed" :
+                return data.get("results", [])
             else:
                 return "计划超过预期次数，请重新调整计划"
         
@@ -249,14 +241,16 @@ class Level2Chain:
             loop_node=Step_Chain,
             continue_condition=step_continue_condition,
             max_iterations=self.max_steps,
-            name="步骤循环处理"
+            name="步骤循环处理",
+            return_iterations=False
         )
 
         Plan_loop_Chain = ChainBuilder.loop(
             loop_node=Step_loop_Chain,
             continue_condition=plan_continue_condition,
             max_iterations=self.max_plan_num,
-            name="计划循环处理"
+            name="计划循环处理",
+            return_iterations=False
         )
         
         # 构建主链：解析 → 循环处理 → 格式化结果
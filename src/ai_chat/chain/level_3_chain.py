@@ -173,10 +173,6 @@ class Level3Chain:
         def single_task_processor(data):
             """单任务处理器 - 处理当前任务"""
             # 确保data是字典类型
-            if isinstance(data, tuple):
-                logger.warning(f"single_task_processor收到tuple类型数据: {data}")
-                data = data[0] if len(data) > 0 and isinstance(data[0], dict) else {}
-            
             if not isinstance(data, dict):
                 logger.error(f"single_task_processor收到非字典数据: {type(data)} - {data}")
                 return {"status": "error", "results": "数据格式错误"}
@@ -224,10 +220,6 @@ class Level3Chain:
         
         def plan_continue_condition(data, iteration):
             """计划循环继续条件"""
-            # 检查data是否为tuple类型，如果是则提取其中的data参数
-            if isinstance(data, tuple):
-                data = data[0] if len(data) > 0 else {}
-            
             if data.get("status", "running") == "completed":
                 return False
             else:
@@ -235,19 +227,14 @@ class Level3Chain:
         
         def format_final_result(data):
             """格式化最终结果"""
-            if isinstance(data, tuple):
-                data1 = data[0][0] if len(data) > 0 else {}
-            else:
-                data1 = data
-                
-            if data1.get("status", "running") == "completed":
-                overall_results = data1.get("overall_results", {})
-                project_name = data1.get("project_name", "未知项目")
+            if data.get("status", "running") == "completed":
+                overall_results = data.get("overall_results", {})
+                project_name = data.get("project_name", "未知项目")
                 
                 summary = f"""
 === 项目测试完成报告 ===
 项目名称: {project_name}
-总任务数: {data1.get("total_tasks", 0)}
+总任务数: {data.get("total_tasks", 0)}
 完成任务: {len(overall_results.get("completed_tasks", []))}
 失败任务: {len(overall_results.get("failed_tasks", []))}
 
@@ -278,7 +265,8 @@ class Level3Chain:
             loop_node=Task_Chain,
             continue_condition=task_continue_condition,
             max_iterations=self.max_tasks,
-            name="任务循环处理"
+            name="任务循环处理",
+            return_iterations=False
         )
 
         # 项目循环链
@@ -286,7 +274,8 @@ class Level3Chain:
             loop_node=Task_loop_Chain,
             continue_condition=plan_continue_condition,
             max_iterations=self.max_plan_num,
-            name="项目循环处理"
+            name="项目循环处理",
+            return_iterations=False
         )
         
         # 构建主链：项目规划 → 任务循环执行 → 格式化结果
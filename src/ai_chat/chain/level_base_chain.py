@@ -77,7 +77,7 @@ class LevelBaseChain:
             str: 处理结果（仅返回内容）
         """
         # 如果容器不存在，创建新容器
-        if container_id not in self.history_manager.get_all_container_ids():
+        if not self.history_manager.has_container(container_id):
             self.history_manager.create_container(container_id)
         
         # 添加用户消息到历史
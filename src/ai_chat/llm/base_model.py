@@ -73,6 +73,8 @@ class BaseLLM(ABC):
             self.temperature: float = temperature
             self.max_tokens: int = max_tokens
             self.system_prompt: Optional[str] = system_prompt
+            self._system_prefix_source: Optional[str] = None  # 生成缓存前缀时使用的系统提示词
+            self._system_prefix: List[Dict[str, Any]] = []    # 缓存的系统消息前缀
             self.llm = ChatOpenAI(
                 model=self.model_name,
                 api_key=self.api_key,
@@ -98,11 +100,11 @@ class BaseLLM(ABC):
         Returns:
             List[Dict[str, Any]]: 完整的消息列表（系统提示词 + 历史对话）
         """
-        messages = []
-        
-        # 如果有系统提示词，添加到最前面
-        if self.system_prompt:
-            messages.append(_system_message(self.system_prompt))
+        # 如果有系统提示词，添加到最前面（系统消息只在提示词变化时重新构造）
+        if self._system_prefix_source is not self.system_prompt:
+            self._system_prefix = [_system_message(self.system_prompt)] if self.system_prompt else []
+            self._system_prefix_source = self.system_prompt
+        messages = list(self._system_prefix)
             
         # 处理输入消息
         if isinstance(query, str):
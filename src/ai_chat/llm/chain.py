@@ -151,7 +151,8 @@ class LoopChain(ChainNode):
                  loop_node: ChainNode,
                  continue_condition: Callable[[Any, int], bool],
                  max_iterations: int = 10,
-                 name: str = None):
+                 name: str = None,
+                 return_iterations: bool = True):
         """
         初始化回环链
         
@@ -160,18 +161,21 @@ class LoopChain(ChainNode):
             continue_condition: 继续条件函数，接收(当前结果, 当前迭代次数)，返回是否继续循环
             max_iterations: 最大迭代次数，防止无限循环
             name: 链的名称
+            return_iterations: 为True时返回(最终结果, 实际执行次数)，为False时只返回最终结果，
+                便于嵌套回环或后续节点直接使用结果
         """
         super().__init__(name or "LoopChain")
         self.loop_node = loop_node
         self.continue_condition = continue_condition
         self.max_iterations = max_iterations
+        self.return_iterations = return_iterations
         
-    def execute(self, input_data: Any) -> Tuple[Any, int]:
+    def execute(self, input_data: Any) -> Union[Tuple[Any, int], Any]:
         """
         执行回环处理
         
         Returns:
-            Tuple[Any, int]: (最终结果, 实际执行次数)
+            Tuple[Any, int]: (最终结果, 实际执行次数)；return_iterations为False时只返回最终结果
         """
         logger.debug(f"开始回环执行链: {self.name}, 输入: {input_data}, 最大迭代次数: {self.max_iterations}")
         
@@ -198,7 +202,9 @@ class LoopChain(ChainNode):
             logger.warning(f"回环链 {self.name} - 达到最大迭代次数 {self.max_iterations}，强制结束")
         
         logger.debug(f"回环链 {self.name} 执行完成, 总迭代次数: {iteration}, 最终输出: {current_data}")
-        return current_data, iteration
+        if self.return_iterations:
+            return current_data, iteration
+        return current_data
 
 
 class MergeChain(ChainNode):
@@ -238,9 +244,10 @@ class ChainBuilder:
     def loop(loop_node: ChainNode, 
              continue_condition: Callable[[Any, int], bool], 
              max_iterations: int = 10, 
-             name: str = None) -> LoopChain:
+             name: str = None,
+             return_iterations: bool = True) -> LoopChain:
         """创建回环链"""
-        return LoopChain(loop_node, continue_condition, max_iterations, name)
+        return LoopChain(loop_node, continue_condition, max_iterations, name, return_iterations)
     
     @staticmethod
     def merge(merge_func: Callable) -> MergeChain:
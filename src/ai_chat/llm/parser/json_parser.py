@@ -1,7 +1,6 @@
 """
     JSON解析器
 """
-import json
 import re
 import os
 import sys
@@ -11,6 +10,7 @@ current_dir = os.path.dirname(__file__)
 project_root = os.path.abspath(os.path.join(current_dir, '..', '..', '..', '..'))
 sys.path.insert(0, project_root)
 
+from src.utils import json_utils
 from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -24,12 +24,12 @@ def json_extract(llm_response: str) -> dict:
         
         if json_start != -1 and json_end > json_start:
             json_str = llm_response[json_start:json_end]
-            return json.loads(json_str)
+            return json_utils.loads(json_str)
         else:
             # 如果没有找到JSON格式，尝试直接解析整个响应
-            return json.loads(llm_response)
+            return json_utils.loads(llm_response)
             
-    except json.JSONDecodeError as e:
+    except json_utils.JSONDecodeError as e:
         logger.error(f"JSON解析失败: {e}, 原始响应: {llm_response}")
         return {
             "difficulty": -1,
@@ -8,6 +8,7 @@
 
 import os
 import sys
+from datetime import datetime
 from typing import Dict, List, Any
 
 # 添加项目根目录到Python路径
@@ -75,6 +76,10 @@ class HistoryManager:
             logger.error(f"清空历史记录失败: {e}")
             return False
     
+    def has_container(self, container_id: str) -> bool:
+        """判断容器是否存在（直接查询字典，不复制全部容器ID）"""
+        return container_id in self.containers
+    
     def get_all_container_ids(self) -> List[str]:
         """获取所有容器ID"""
         return list(self.containers.keys())
@@ -93,5 +98,4 @@ class HistoryManager:
     
     def _get_timestamp(self) -> str:
         """获取当前时间戳"""
-        import datetime
-        return datetime.datetime.now().isoformat() 
\ No newline at end of file
+        return datetime.now().isoformat() 
\ No newline at end of file
@@ -224,10 +224,6 @@ class Level3Chain:
         def single_task_processor(data):
             """单任务处理器 - 处理当前任务"""
             # 确保data是字典类型
-            if isinstance(data, tuple):
-                logger.warning(f"single_task_processor收到tuple类型数据: {data}")
-                data = data[0] if len(data) > 0 and isinstance(data[0], dict) else {}
-            
             if not isinstance(data, dict):
                 logger.error(f"single_task_processor收到非字典数据: {type(data)} - {data}")
                 return {"计划状态": "error", "计划结果": "数据格式错误"}
@@ -286,10 +282,6 @@ class Level3Chain:
         
         def plan_continue_condition(data, iteration):
             """计划循环继续条件"""
-            # 检查data是否为tuple类型，如果是则提取其中的data参数
-            if isinstance(data, tuple):
-                data = data[0] if len(data) > 0 else {}
-            
             json_a_data = data.get("Json A样式", {})
             if json_a_data.get("计划状态", "running") == "completed":
                 return False
@@ -298,17 +290,12 @@ class Level3Chain:
         
         def format_final_result(data):
             """格式化最终结果"""
-            if isinstance(data, tuple):
-                data1 = data[0][0] if len(data) > 0 else {}
-            else:
-                data1 = data
-                
-            json_a_data = data1.get("Json A样式", {})
+            json_a_data = data.get("Json A样式", {})
             if json_a_data.get("计划状态", "running") == "completed":
                 
                 summary = f"""
 === 项目测试完成报告 ===
-总任务数: {data1.get("任务总数", 0)}
+总任务数: {data.get("任务总数", 0)}
 计划时间: {json_a_data.get("计划时间", "未知")}
 
 测试摘要:
@@ -338,7 +325,8 @@ class Level3Chain:
             loop_node=Task_Chain,
             continue_condition=task_continue_condition,
             max_iterations=self.max_tasks,
-            name="任务循环处理"
+            name="任务循环处理",
+            return_iterations=False
         )
 
         # 项目循环链
@@ -346,7 +334,8 @@ class Level3Chain:
             loop_node=Task_loop_Chain,
             continue_condition=plan_continue_condition,
             max_iterations=self.max_plan_num,
-            name="项目循环处理"
+            name="项目循环处理",
+            return_iterations=False
         )
         
         # 构建主链：项目规划 → 任务循环执行 → 格式化结果
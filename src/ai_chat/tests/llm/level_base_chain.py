@@ -4,6 +4,7 @@
 """
 import os
 import sys
+from datetime import datetime
 from typing import Dict, Any
 
 # 添加项目根目录到Python路径
@@ -83,7 +84,7 @@ class LevelBaseChain:
             str: 处理结果（仅返回内容）
         """
         # 如果容器不存在，创建新容器
-        if container_id not in self.history_manager.get_all_container_ids():
+        if not self.history_manager.has_container(container_id):
             self.history_manager.create_container(container_id)
         
         # 添加用户消息到历史
@@ -141,7 +142,6 @@ class LevelBaseChain:
             # 如果是难度2或3，生成计划ID
             if difficulty in [2, 3]:
                 # 使用时间戳生成计划ID
-                from datetime import datetime
                 timestamp = datetime.now()
                 date_str = timestamp.strftime("%Y%m%d")
                 time_str = timestamp.strftime("%H%M%S")
@@ -10,6 +10,8 @@
 @version: 2.0.0
 """
 
+import copy
+import functools
 import json
 import os
 from pathlib import Path
@@ -17,6 +19,18 @@ from typing import Dict, Any, Optional
 import logging
 
 
+@functools.lru_cache(maxsize=4)
+def _read_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    读取并解析配置文件
+    
+    结果按(路径, 修改时间)缓存，同一进程内重复创建Settings不再重复解析；
+    文件被修改后修改时间变化，缓存自动失效。调用方需自行复制返回值后再修改。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class Settings:
     """
     应用设置管理器
@@ -104,8 +118,9 @@ class Settings:
         """加载配置文件"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
+                loaded_config = copy.deepcopy(_read_config_file(
+                    str(self.config_file), self.config_file.stat().st_mtime_ns
+                ))
                 
                 # 合并默认配置和加载的配置
                 self.config = self._merge_configs(self._default_config, loaded_config)
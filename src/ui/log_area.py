@@ -10,6 +10,10 @@ from PySide6.QtGui import QFont
 from datetime import datetime
 
 
+# 日志区域最多保留的行数，超出后自动丢弃最旧的行
+MAX_LOG_LINES = 5000
+
+
 class LogArea(QFrame):
     """
     日志区域组件
@@ -80,6 +84,8 @@ class LogArea(QFrame):
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setFont(QFont("Consolas", 9))
+        # 限制文档行数，使日志区域成为固定容量的环形缓冲
+        self.log_text.document().setMaximumBlockCount(MAX_LOG_LINES)
         self.log_text.setStyleSheet("""
             QTextEdit {
                 background-color: #2d3748;
@@ -406,13 +406,14 @@ class ModernLoginWindow(QWidget):
     def apply_theme(self):
         """应用主题"""
         themes = {
-            "深色主题": self.get_dark_theme(),
-            "浅色主题": self.get_light_theme(),
-            "蓝色主题": self.get_blue_theme()
+            "深色主题": self.get_dark_theme,
+            "浅色主题": self.get_light_theme,
+            "蓝色主题": self.get_blue_theme
         }
         
         theme_name = self.theme_combo.currentText() if hasattr(self, 'theme_combo') else "深色主题"
-        stylesheet = themes.get(theme_name, themes["深色主题"])
+        # 只生成当前选中主题的样式表
+        stylesheet = themes.get(theme_name, self.get_dark_theme)()
         
         self.setStyleSheet(stylesheet)
         logger.info(f"应用主题: {theme_name}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+JSON工具模块
+
+优先使用orjson（C实现，解析和序列化更快），未安装时回退到标准库json，
+调用方无需关心具体实现。
+
+@author: PankIns Team
+@version: 1.0.0
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson.JSONDecodeError是json.JSONDecodeError的子类，统一捕获该异常即可
+JSONDecodeError = json.JSONDecodeError
+
+
+def _to_builtin(obj):
+    """
+    将JSON无法直接表示的对象（numpy数组/标量等带tolist()的对象）转换为内置类型
+    
+    Args:
+        obj: 无法直接序列化的对象
+        
+    Returns:
+        可序列化的内置类型对象
+    """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def loads(data):
+        """
+        解析JSON字符串或字节串
+        
+        Args:
+            data: JSON文本（str/bytes）
+            
+        Returns:
+            解析后的Python对象
+        """
+        return orjson.loads(data)
+    
+    def dumps(obj) -> bytes:
+        """
+        序列化为UTF-8编码的JSON字节串
+        
+        Args:
+            obj: 要序列化的Python对象（支持numpy数组）
+            
+        Returns:
+            bytes: JSON字节串
+        """
+        return orjson.dumps(obj, default=_to_builtin, option=orjson.OPT_SERIALIZE_NUMPY)
+else:
+    loads = json.loads
+    
+    def dumps(obj) -> bytes:
+        """
+        序列化为UTF-8编码的JSON字节串
+        
+        Args:
+            obj: 要序列化的Python对象（支持numpy数组）
+            
+        Returns:
+            bytes: JSON字节串
+        """
+        return json.dumps(obj, ensure_ascii=False, default=_to_builtin).encode("utf-8")
@@ -14,6 +14,7 @@
 import os
 import logging
 import sys
+import time
 from logging.handlers import RotatingFileHandler
 from typing import Optional, Union
 
@@ -91,7 +92,31 @@ def get_level_name(level: Union[str, int]) -> str:
     return LOG_LEVEL_MAP.get(numeric_level, 'INFO')
 
 
-class ColoredFormatter(logging.Formatter):
+class CachedTimeFormatter(logging.Formatter):
+    """
+    缓存时间字符串的日志格式器
+    
+    datefmt精确到秒，同一秒内的记录复用上一次strftime的结果，
+    日志密集时可省去大部分时间格式化开销
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = ''
+    
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(datefmt, self.converter(second))
+            self._cached_second = second
+        return self._cached_time
+
+
+class ColoredFormatter(CachedTimeFormatter):
     """带颜色的控制台日志格式器"""
     
     # 定义颜色代码
@@ -128,13 +153,73 @@ class LevelFilter(logging.Filter):
         if not isinstance(levels, list):
             levels = [levels]
         
-        # 标准化所有级别为数字
-        self.levels = [normalize_log_level(level) for level in levels]
+        # 标准化所有级别为数字，过滤时只做整数集合查找
+        self.levels = frozenset(normalize_log_level(level) for level in levels)
     
     def filter(self, record):
         return record.levelno in self.levels
 
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    带写缓冲的轮转文件处理器
+    
+    标准的RotatingFileHandler每写一条记录都会flush，并通过seek/tell检查文件大小，
+    两者都会强制清空缓冲区。这里改为自行累计文件大小(按编码后的字节数)，低于
+    flush_level的记录只写入缓冲区，由缓冲区写满、遇到高级别记录或处理器关闭时统一落盘。
+    
+    注意：正常退出时logging模块注册的atexit钩子(logging.shutdown)会关闭处理器并
+    写出缓冲区；但进程被强制终止或崩溃时，写缓冲区(默认64 KiB)中尚未落盘的
+    INFO/DEBUG等低于flush_level的记录会丢失，达到flush_level(默认WARNING)的记录
+    及其之前的记录已经落盘，不受影响。
+    """
+    
+    def __init__(self, *args, buffer_size: int = 64 * 1024,
+                 flush_level: Union[str, int] = logging.WARNING, **kwargs):
+        """
+        Args:
+            buffer_size: 文件写缓冲区大小(字节)
+            flush_level: 达到该级别的记录会立即落盘
+            其余参数同RotatingFileHandler
+        """
+        self.buffer_size = buffer_size
+        self.flush_level = normalize_log_level(flush_level)
+        self._stream_size = 0
+        self._pending_size = 0
+        self._defer_flush = False
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=getattr(self, 'errors', None))
+        try:
+            self._stream_size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._stream_size = 0
+        return stream
+    
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = self.format(record) + self.terminator
+            self._pending_size = len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+            return self._stream_size + self._pending_size >= self.maxBytes
+        return False
+    
+    def emit(self, record):
+        self._defer_flush = record.levelno < self.flush_level
+        try:
+            super().emit(record)
+            self._stream_size += self._pending_size
+        finally:
+            self._defer_flush = False
+    
+    def flush(self):
+        if not self._defer_flush:
+            super().flush()
+
+
 def setup_logging(level: Union[str, int] = "INFO", 
                  console_level: Union[str, int] = "INFO",
                  file_level: Union[str, int] = "DEBUG",
@@ -186,7 +271,7 @@ def setup_logging(level: Union[str, int] = "INFO",
             datefmt='%H:%M:%S'
         )
     else:
-        console_formatter = logging.Formatter(
+        console_formatter = CachedTimeFormatter(
         '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
             datefmt='%H:%M:%S'
         )
@@ -197,14 +282,14 @@ def setup_logging(level: Union[str, int] = "INFO",
     # ========== 文件处理器 ==========
     
     # 1. 综合日志文件 (所有级别)
-    all_file_handler = RotatingFileHandler(
+    all_file_handler = BufferedRotatingFileHandler(
         os.path.join(log_dir, 'system.log'),
         maxBytes=max_file_size,
         backupCount=backup_count,
         encoding='utf-8'
     )
     all_file_handler.setLevel(file_numeric_level)
-    all_file_formatter = logging.Formatter(
+    all_file_formatter = CachedTimeFormatter(
         '%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -224,7 +309,7 @@ def setup_logging(level: Union[str, int] = "INFO",
     
     # 3. 调试日志文件 (DEBUG级别，使用大小轮转而不是时间轮转)
     if file_numeric_level <= 10:  # DEBUG级别
-        debug_file_handler = RotatingFileHandler(
+        debug_file_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, 'debug.log'),
             maxBytes=max_file_size,  # 使用大小轮转
             backupCount=3,  # 保留3个备份文件
@@ -232,7 +317,7 @@ def setup_logging(level: Union[str, int] = "INFO",
         )
         debug_file_handler.setLevel(10)  # DEBUG级别
         debug_file_handler.addFilter(LevelFilter([10]))  # 只记录DEBUG级别
-        debug_formatter = logging.Formatter(
+        debug_formatter = CachedTimeFormatter(
             '%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(funcName)s() - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
@@ -254,7 +339,7 @@ def setup_logging(level: Union[str, int] = "INFO",
         encoding='utf-8'
     )
     perf_file_handler.setLevel(20)  # INFO级别
-    perf_formatter = logging.Formatter(
+    perf_formatter = CachedTimeFormatter(
         '%(asctime)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -385,16 +470,21 @@ def log_function_call(func):
     Returns:
         装饰后的函数
     """
+    logger = get_logger(func.__module__)
+    
     def wrapper(*args, **kwargs):
-        logger = get_logger(func.__module__)
-        logger.debug(f"调用函数: {func.__name__}(args={args}, kwargs={kwargs})")
+        # DEBUG未启用时跳过参数格式化（repr大参数的开销可能远超函数本身）
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("调用函数: %s(args=%s, kwargs=%s)", func.__name__, args, kwargs)
         
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"函数 {func.__name__} 执行成功")
+            if debug_enabled:
+                logger.debug("函数 %s 执行成功", func.__name__)
             return result
         except Exception as e:
-            logger.error(f"函数 {func.__name__} 执行失败: {e}")
+            logger.error("函数 %s 执行失败: %s", func.__name__, e)
             raise
     
     return wrapper
@@ -0,0 +1,114 @@
+"""
+AI Actor测试
+
+不初始化LLM chain，只验证AI Actor自身的消息处理逻辑
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.actors.ai_actor import AIActor, AIActorManager, MAX_ACTIVE_CONTAINERS
+
+
+class RecordingHistoryManager:
+    """记录删除操作的历史管理器"""
+
+    def __init__(self):
+        self.removed = []
+
+    def remove_container(self, container_id):
+        self.removed.append(container_id)
+
+
+class RecordingRef:
+    """记录tell消息的Actor引用替身"""
+
+    def __init__(self):
+        self.told = []
+
+    def tell(self, message):
+        self.told.append(message)
+
+
+class RecordingChain:
+    """只带历史管理器的chain替身"""
+
+    def __init__(self):
+        self.history_manager = RecordingHistoryManager()
+
+
+def test_active_containers_bounded_without_removing_history():
+    """
+    测试活跃容器记录有上限，且超出上限时不删除对话历史
+    """
+    actor = AIActor()
+    actor.chain = RecordingChain()
+
+    for index in range(MAX_ACTIVE_CONTAINERS + 10):
+        actor._touch_container(f"container_{index}")
+    # 重新使用最早的容器后，它成为最近使用的记录
+    actor._touch_container("container_10")
+
+    assert len(actor.active_containers) == MAX_ACTIVE_CONTAINERS
+    assert "container_0" not in actor.active_containers
+    assert list(actor.active_containers)[-1] == "container_10"
+    assert actor.chain.history_manager.removed == []
+
+
+def test_stream_updates_sent_in_order():
+    """
+    测试流式更新立即按顺序发送给UI Actor（片段由UI Actor按帧合并）
+    """
+    actor = AIActor()
+    actor.ui_actor_ref = RecordingRef()
+    events = [("START_STREAM", None), ("STREAM_CHUNK", "你"), ("STREAM_CHUNK", "好"), ("END_STREAM", None)]
+
+    for event_type, data in events:
+        actor._send_stream_update(event_type, data)
+
+    told = [(message['event_type'], message['data']) for message in actor.ui_actor_ref.told]
+    assert told == events
+
+
+def test_batch_returns_per_item_results():
+    """
+    测试批量消息的结果与各条消息一一对应，出错的消息不影响其他消息
+    """
+    actor_ref = AIActor.start()
+    try:
+        results = actor_ref.ask({'action': 'batch', 'items': [
+            {'action': 'get_status'},
+            {'action': 'unknown_action'},
+            "不是字典的消息",
+            {'action': 'get_status'},
+        ]}, timeout=5.0)
+    finally:
+        actor_ref.stop()
+
+    assert len(results) == 4
+    assert results[0]["actor_type"] == "AIActor"
+    assert results[1] == {"status": "error", "message": "未知消息类型: unknown_action"}
+    assert results[2] == {"status": "error", "message": "消息格式错误"}
+    assert results[3]["actor_type"] == "AIActor"
+
+
+def test_nested_batch_rejected():
+    """
+    测试批量消息中嵌套的批量消息被拒绝，同批的其他消息照常处理
+    """
+    manager = AIActorManager()
+    manager.start()
+    try:
+        results = manager.send_message_batch([
+            {'action': 'batch', 'items': [{'action': 'get_status'}]},
+            {'action': 'get_status'},
+        ])
+        assert manager.send_message_batch([]) == []
+    finally:
+        manager.stop()
+
+    assert results[0] == {"status": "error", "message": "批量消息不能嵌套"}
+    assert results[1]["actor_type"] == "AIActor"
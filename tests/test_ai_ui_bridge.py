@@ -0,0 +1,120 @@
+"""
+AI-UI桥接器测试
+
+通过真实启动的Actor验证桥接器在Actor边界上发送的消息格式
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pykka
+
+from src.actors.ai_actor import AIActor
+from src.actors.ai_ui_bridge import AIUIBridge
+
+
+class RecorderActor(pykka.ThreadingActor):
+    """记录收到的消息的Actor"""
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def on_receive(self, message):
+        if message == "get_received":
+            return self.received
+        self.received.append(message)
+
+
+class AskingRef:
+    """把tell转为ask的Actor引用包装，用于取回Actor对桥接器消息的回复"""
+
+    def __init__(self, actor_ref):
+        self.actor_ref = actor_ref
+        self.replies = []
+
+    def tell(self, message):
+        self.replies.append(self.actor_ref.ask(message, timeout=5.0))
+
+
+def test_bridge_sends_dict_messages():
+    """
+    测试桥接器发送给Actor的消息是字典
+    """
+    recorder = RecorderActor.start()
+    try:
+        bridge = AIUIBridge()
+        bridge.register_ai_actor(recorder)
+        bridge.register_ui_actor(recorder)
+
+        request_id = bridge.send_ai_query("测量通道1频率")
+        bridge.update_ui_status("connection", "connected")
+
+        received = recorder.ask("get_received", timeout=5.0)
+    finally:
+        recorder.stop()
+
+    assert len(received) == 2
+    assert all(isinstance(message, dict) for message in received)
+    assert received[0]["type"] == "ai_chat_query"
+    assert received[0]["correlation_id"] == request_id
+    assert received[0]["data"]["query"] == "测量通道1频率"
+    assert received[1]["type"] == "ui_status_update"
+
+
+def test_ai_actor_accepts_bridge_message():
+    """
+    测试AI Actor不会以"消息格式错误"拒绝桥接器发送的消息
+    """
+    ai_actor = AIActor.start()
+    try:
+        asking_ref = AskingRef(ai_actor)
+        bridge = AIUIBridge()
+        bridge.register_ai_actor(asking_ref)
+        bridge.send_ai_query("你好")
+        replies = asking_ref.replies
+    finally:
+        ai_actor.stop()
+
+    assert len(replies) == 1
+    assert replies[0].get("message") != "消息格式错误"
+
+
+def test_handle_response_passes_dict_to_callback():
+    """
+    测试响应回调收到的是响应字典
+    """
+    recorder = RecorderActor.start()
+    try:
+        responses = []
+        bridge = AIUIBridge()
+        bridge.register_ai_actor(recorder)
+        request_id = bridge.send_ai_query("你好", callback=responses.append)
+
+        bridge.handle_response({"correlation_id": str(request_id), "content": "你好！"})
+    finally:
+        recorder.stop()
+
+    assert responses == [{"correlation_id": str(request_id), "content": "你好！"}]
+    assert bridge.get_stats()["pending_requests"] == 0
+
+
+def test_answered_requests_do_not_accumulate():
+    """
+    测试已响应的请求不会在请求队列中累积
+    """
+    recorder = RecorderActor.start()
+    try:
+        bridge = AIUIBridge()
+        bridge.register_ai_actor(recorder)
+        for _ in range(100):
+            request_id = bridge.send_ai_query("你好", callback=lambda response: None)
+            bridge.handle_response({"correlation_id": request_id})
+    finally:
+        recorder.stop()
+
+    assert len(bridge._request_order) == 0
+    assert bridge.get_stats()["pending_requests"] == 0
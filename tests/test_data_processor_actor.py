@@ -0,0 +1,158 @@
+"""
+数据处理Actor测试
+
+验证统计分析结果与numpy对应函数的结果一致，以及数据缓冲区的容量与溢出行为
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from src.actors.data_processor_actor import DataProcessorActor
+
+
+@pytest.fixture
+def data_processor():
+    """启动一个数据处理Actor，测试结束后停止"""
+    actor_ref = DataProcessorActor.start()
+    yield actor_ref
+    actor_ref.stop()
+
+
+def analyze(actor_ref, values):
+    """发送统计分析请求并返回统计结果"""
+    result = actor_ref.ask({'action': 'analyze_statistics', 'data': {'data': values}}, timeout=5.0)
+    assert result["status"] == "ok"
+    return result["data"]
+
+
+def expected_statistics(values):
+    """用numpy原始函数计算的统计结果"""
+    np_data = np.array(values)
+    return {
+        'count': len(np_data),
+        'mean': float(np.mean(np_data)),
+        'std': float(np.std(np_data)),
+        'min': float(np.min(np_data)),
+        'max': float(np.max(np_data)),
+        'median': float(np.median(np_data)),
+        'variance': float(np.var(np_data))
+    }
+
+
+def assert_statistics_equal(actual, expected):
+    """逐项比较统计结果（NaN视为相等）"""
+    assert actual.keys() == expected.keys()
+    assert actual['count'] == expected['count']
+    for key in ('mean', 'std', 'min', 'max', 'median', 'variance'):
+        if math.isnan(expected[key]):
+            assert math.isnan(actual[key]), key
+        else:
+            assert actual[key] == pytest.approx(expected[key]), key
+
+
+@pytest.mark.parametrize("values", [
+    [3.0, 1.0, 2.0],
+    [4, 1, 3, 2],
+    [5.0],
+])
+def test_statistics_match_numpy(data_processor, values):
+    """
+    测试一维数据的统计结果
+    """
+    assert_statistics_equal(analyze(data_processor, values), expected_statistics(values))
+
+
+@pytest.mark.parametrize("values", [
+    [1.0, float("nan"), 3.0],
+    [float("nan"), 2.0, 1.0, 4.0],
+])
+def test_statistics_with_nan(data_processor, values):
+    """
+    测试含NaN的数据：与np.min/np.max/np.median一致，结果均为NaN
+    """
+    statistics = analyze(data_processor, values)
+    for key in ('mean', 'std', 'min', 'max', 'median', 'variance'):
+        assert math.isnan(statistics[key]), key
+    assert statistics['count'] == len(values)
+
+
+def test_statistics_with_2d_input(data_processor):
+    """
+    测试二维数据：按全部元素统计，count为行数
+    """
+    values = [[1.0, 5.0, 2.0], [4.0, 3.0, 6.0]]
+    statistics = analyze(data_processor, values)
+    assert_statistics_equal(statistics, expected_statistics(values))
+    assert statistics['count'] == 2
+
+
+def process(actor_ref, frame):
+    """发送单帧数据处理请求并返回结果"""
+    return actor_ref.ask({'action': 'process_data', 'data': frame}, timeout=5.0)
+
+
+def buffered_frames(actor_ref):
+    """取出缓冲区中各帧的编号"""
+    return [entry['frame'] for entry in actor_ref.proxy().data_buffer.get(timeout=5.0)]
+
+
+def test_buffer_cap_spills_oldest_frames(tmp_path):
+    """
+    测试缓冲区超出buf_cap时，最旧的帧按顺序写入溢出文件
+    """
+    spill_file = tmp_path / "spill.ndjson"
+    actor_ref = DataProcessorActor.start(config={'buf_cap': 3, 'spill_file': str(spill_file)})
+    try:
+        for index in range(5):
+            assert process(actor_ref, {'frame': index})["status"] == "ok"
+        assert buffered_frames(actor_ref) == [2, 3, 4]
+        spilled = [json.loads(line) for line in spill_file.read_text(encoding="utf-8").splitlines()]
+        assert spilled == [{'frame': 0}, {'frame': 1}]
+    finally:
+        actor_ref.stop()
+
+    # 停止时缓冲区剩余的帧也写入溢出文件
+    lines = spill_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)['frame'] for line in lines] == [0, 1, 2, 3, 4]
+
+
+def test_unserializable_frame_is_dropped_alone(tmp_path):
+    """
+    测试无法序列化的帧只丢弃该帧，不影响其他帧，也不会重复留在缓冲区
+    """
+    spill_file = tmp_path / "spill.ndjson"
+    actor_ref = DataProcessorActor.start(config={'buf_cap': 1, 'spill_file': str(spill_file)})
+    try:
+        assert process(actor_ref, {'frame': 0, 'tags': {'a'}})["status"] == "ok"
+        assert process(actor_ref, {'frame': 1})["status"] == "ok"
+        assert process(actor_ref, {'frame': 2})["status"] == "ok"
+        assert buffered_frames(actor_ref) == [2]
+    finally:
+        actor_ref.stop()
+
+    lines = spill_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)['frame'] for line in lines] == [1, 2]
+
+
+def test_buffer_cap_holds_when_spill_file_unwritable(tmp_path):
+    """
+    测试溢出文件无法写入时缓冲区仍保持容量上限，且处理结果不报错
+    """
+    # 溢出文件的父路径是普通文件，无法创建目录
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    actor_ref = DataProcessorActor.start(config={'buf_cap': 2, 'spill_file': str(blocker / "spill.ndjson")})
+    try:
+        for index in range(5):
+            assert process(actor_ref, {'frame': index})["status"] == "ok"
+        assert buffered_frames(actor_ref) == [3, 4]
+    finally:
+        actor_ref.stop()
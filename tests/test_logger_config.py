@@ -0,0 +1,96 @@
+"""
+日志配置测试
+
+验证带写缓冲的轮转文件处理器与缓存时间的日志格式器
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.utils.logger_config import BufferedRotatingFileHandler, CachedTimeFormatter
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """日志文件路径"""
+    return tmp_path / "app.log"
+
+
+def make_handler(log_file, **kwargs):
+    """创建只输出消息内容的处理器"""
+    handler = BufferedRotatingFileHandler(str(log_file), encoding="utf-8", **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def make_record(message, level=logging.INFO, created=None):
+    """创建日志记录"""
+    record = logging.LogRecord("test", level, __file__, 0, message, None, None)
+    if created is not None:
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+    return record
+
+
+def test_rollover_counts_encoded_bytes(log_file):
+    """
+    测试按编码后的字节数判断轮转：20个汉字为60字节，两条即超过100字节
+    """
+    handler = make_handler(log_file, maxBytes=100, backupCount=1)
+    try:
+        message = "示" * 20
+        handler.emit(make_record(message))
+        handler.emit(make_record(message))
+    finally:
+        handler.close()
+
+    assert Path(f"{log_file}.1").read_text(encoding="utf-8") == message + "\n"
+    assert log_file.read_text(encoding="utf-8") == message + "\n"
+
+
+def test_low_level_records_stay_buffered(log_file):
+    """
+    测试低于flush_level的记录只写入缓冲区，达到flush_level时立即落盘
+    """
+    handler = make_handler(log_file)
+    try:
+        handler.emit(make_record("调试信息", logging.DEBUG))
+        handler.emit(make_record("普通信息", logging.INFO))
+        assert log_file.read_text(encoding="utf-8") == ""
+
+        handler.emit(make_record("警告信息", logging.WARNING))
+        assert log_file.read_text(encoding="utf-8") == "调试信息\n普通信息\n警告信息\n"
+    finally:
+        handler.close()
+
+
+def test_close_writes_buffer(log_file):
+    """
+    测试关闭处理器时写出缓冲区中的记录
+    """
+    handler = make_handler(log_file)
+    handler.emit(make_record("普通信息"))
+    assert log_file.read_text(encoding="utf-8") == ""
+
+    handler.close()
+    assert log_file.read_text(encoding="utf-8") == "普通信息\n"
+
+
+@pytest.mark.parametrize("datefmt", [None, "%Y-%m-%d %H:%M:%S", "%H:%M:%S"])
+def test_cached_time_matches_formatter(datefmt):
+    """
+    测试缓存的时间字符串与logging.Formatter.formatTime一致，包括跨越秒边界时
+    """
+    cached = CachedTimeFormatter(datefmt=datefmt)
+    plain = logging.Formatter(datefmt=datefmt)
+    # 同一秒内的两条记录，随后是下一秒和更晚的记录
+    for created in (1700000000.25, 1700000000.75, 1700000000.999, 1700000001.0, 1700000003.5):
+        record = make_record("消息", created=created)
+        assert cached.formatTime(record, datefmt) == plain.formatTime(record, datefmt)
+        assert cached.format(record) == plain.format(record)
@@ -0,0 +1,103 @@
+"""
+UI Actor测试
+
+验证流式片段在主线程中按帧合并刷新的行为（不启动事件循环，直接调用主线程方法）
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from src.actors.ui_actor import UIActor
+
+
+class RecordingWindow:
+    """记录流式界面调用顺序的主窗口替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    def start_stream_response(self):
+        self.calls.append(("start",))
+
+    def set_ai_chat_streaming_state(self, streaming):
+        self.calls.append(("streaming", streaming))
+
+    def append_stream_chunk(self, text):
+        self.calls.append(("append", text))
+
+    def maintain_ai_chat_scroll_position(self):
+        pass
+
+    def finish_stream_response(self):
+        self.calls.append(("finish",))
+
+
+@pytest.fixture
+def ui_actor():
+    """创建UI Actor（不启动Actor线程）"""
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    actor = UIActor()
+    yield actor
+    actor._stream_flush_timer.stop()
+
+
+def stream(actor, event_type, data=None):
+    """模拟AI Actor发来的流式更新"""
+    result = actor._handle_ai_chat_update_stream({'event_type': event_type, 'data': data})
+    assert result["status"] == "ok"
+
+
+def test_chunks_flushed_in_order(ui_actor):
+    """
+    测试一帧内到达的片段按到达顺序合并为一次追加
+    """
+    ui_actor.main_window = RecordingWindow()
+    for chunk in ("示波", "器", "已连接"):
+        stream(ui_actor, "STREAM_CHUNK", chunk)
+
+    ui_actor._flush_stream_chunks()
+
+    assert ui_actor.main_window.calls == [("append", "示波器已连接")]
+
+
+def test_end_stream_flushes_remaining_chunks(ui_actor):
+    """
+    测试END_STREAM先刷新剩余片段，再结束流式响应
+    """
+    window = RecordingWindow()
+    ui_actor.main_window = window
+    stream(ui_actor, "STREAM_CHUNK", "你")
+    stream(ui_actor, "STREAM_CHUNK", "好")
+
+    ui_actor._on_ai_stream_event("END_STREAM", None)
+
+    assert window.calls == [("append", "你好"), ("finish",), ("streaming", False)]
+    assert ui_actor._stream_chunks == []
+
+
+def test_chunks_dropped_without_window(ui_actor):
+    """
+    测试没有主窗口时片段被丢弃，不会滞留在缓冲区中
+    """
+    stream(ui_actor, "STREAM_CHUNK", "丢弃")
+    assert ui_actor._stream_chunks == []
+
+    # 片段缓冲后主窗口被关闭：刷新时清空缓冲区，之后的片段仍能正常刷新
+    window = RecordingWindow()
+    ui_actor.main_window = window
+    stream(ui_actor, "STREAM_CHUNK", "旧片段")
+    ui_actor.main_window = None
+    ui_actor._flush_stream_chunks()
+    assert ui_actor._stream_chunks == []
+
+    ui_actor.main_window = window
+    stream(ui_actor, "STREAM_CHUNK", "新片段")
+    ui_actor._flush_stream_chunks()
+    assert window.calls == [("append", "新片段")]